@@ -1,124 +1,113 @@
 #animal.py
-import random
+from rng import MOVE, FEED, DEATH, REPRODUCE
+from entity import Kind, LIVE, DEAD, REGISTRY_SLOTS
+from indexes import KINDS as INDEX_KINDS
+
+# Desplazamiento (dx, dy) de cada dirección de movimiento: arriba, abajo, izquierda, derecha
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
 
 class AnimalSmall:
+    __slots__ = ('x', 'y', 'hp', 'ticks_alive', 'consecutive_ticks_without_consuming', 'state') + REGISTRY_SLOTS
+    kind = Kind.ANIMAL_SMALL
+    FOOD = {Kind.PLANT_LOW: 1, Kind.FUNGI: 1}  # Bocado por tipo de comida: 1 hp de PlantLow o de hongo
+    family = 'animal'  # Clases con la misma familia comparten memoria y pool
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.size = 'small'
         self.hp = 5
         self.ticks_alive = 0
         self.consecutive_ticks_without_consuming = 0
-        self.state = 'live'
-
-    def move(self, grid):
-        """Se mueve aleatoriamente de 1 a 3 celdas en una dirección aleatoria."""
-        if self.state == 'dead':
-            return
+        self.state = LIVE
 
-        directions = ['up', 'down', 'left', 'right']
-        direction = random.choice(directions)
-        move_distance = random.randint(1, 3)
+    def propose_move(self, world):
+        """Fase de intención: celda (índice) a 1-3 celdas en una dirección aleatoria a la que quiere ir, o None.
 
-        nx, ny = self.x, self.y  # Posición actual
+        No modifica la cuadrícula; World resuelve después los conflictos entre animales.
+        """
+        if self.state != LIVE:
+            return None
 
-        if direction == 'up' and self.y - move_distance >= 0:
-            ny -= move_distance
-        elif direction == 'down' and self.y + move_distance < len(grid):
-            ny += move_distance
-        elif direction == 'left' and self.x - move_distance >= 0:
-            nx -= move_distance
-        elif direction == 'right' and self.x + move_distance < len(grid[0]):
-            nx += move_distance
+        dx, dy = world.rng.choice(MOVE, self.id, DIRECTIONS)
+        move_distance = world.rng.randint(MOVE, self.id, 1, 3, draw=1)
+        return world.path_target(self.x, self.y, dx, dy, move_distance)
 
-        # Asegurar que el movimiento no colisione con otro objeto
-        if grid[ny][nx] is None:
-            grid[self.y][self.x] = None  # Vaciar la celda anterior
-            self.x, self.y = nx, ny
-            grid[self.y][self.x] = self
+    def act(self, world):
+        """Acciones del tick tras la fase de movimiento: edad, consumo, crecimiento y hambre."""
+        if self.state == DEAD:
+            return
 
         self.ticks_alive += 1  # Incrementar ticks
 
         # Revisión de consumo de plantas después del movimiento
-        self.consume_plant(grid)
+        self.consume_plant(world)
 
-        # Evolución a AnimalBig después de 12 ticks
-        if self.ticks_alive >= 12:
-            self.size = 'big'
-            grid[self.y][self.x] = AnimalBig(self.x, self.y)
+        # Evolución a AnimalBig después de 12 ticks (en el mismo objeto: conserva edad y hambre)
+        if self.kind == Kind.ANIMAL_SMALL and self.ticks_alive >= 12:
+            world.transform(self, AnimalBig)
+            self.hp = 10
 
         # Muerte si no come en 3 ticks
         if self.consecutive_ticks_without_consuming >= 3:
-            self.state = 'dead'
-
-    def consume_plant(self, grid):
-        """Consume una planta aleatoria cerca del animal."""
-        plants_nearby = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx = self.x + dx
-                ny = self.y + dy
-                if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]):
-                    cell = grid[ny][nx]
-                    if hasattr(cell, 'plant_type') and cell.plant_type == 'low':
-                        plants_nearby.append(cell)
-
-        if plants_nearby:
-            plant = random.choice(plants_nearby)
-            plant.energy -= 1  # Small solo puede comer PlantLow
+            self.state = DEAD
+
+    def consume_plant(self, world):
+        """Consume de una planta u hongo aleatorio cerca del animal (los bocados de FOOD)."""
+        food = self.FOOD
+        food_nearby = []
+        if any(world.index.count(INDEX_KINDS[kind - 1], self.x, self.y) for kind in food):  # Sólo si hay comida cerca
+            if world.metrics is not None:
+                world.metrics.count("cells_scanned", 9)
+            grid = world.grid
+            for dx in [-1, 0, 1]:
+                for dy in [-1, 0, 1]:
+                    nx = self.x + dx
+                    ny = self.y + dy
+                    if 0 <= nx < world.width and 0 <= ny < world.height:
+                        cell = grid[ny][nx]
+                        if getattr(cell, 'kind', None) in food and cell.state == LIVE:
+                            food_nearby.append(cell)
+
+        if food_nearby:
+            target = world.rng.choice(FEED, self.id, food_nearby)
+            world.consume(target, food[target.kind])
             self.consecutive_ticks_without_consuming = 0  # Reiniciar contador de hambre
         else:
             self.consecutive_ticks_without_consuming += 1  # No encontró comida, aumenta hambre
 
-    def check_death(self):
+    def lifespan(self, world):
+        """Vida máxima: 24 ticks (+/-1 de variación), sorteada en el tick actual."""
+        return 24 + world.rng.randint(DEATH, self.id, -1, 1)
+
+    def check_death(self, world):
         """El animal muere después de 24 ticks (+/-1 de variación)."""
-        if self.ticks_alive >= 24 + random.randint(-1, 1):  # Límite de vida
-            self.state = 'dead'
+        if self.ticks_alive >= self.lifespan(world):  # Límite de vida
+            self.state = DEAD
 
-    def check_reproduction(self, grid):
-        """Genera un nuevo animal si hay otro cerca con 50% de probabilidad."""
+    def check_reproduction(self, world):
+        """Genera un animal pequeño a su lado si hay otro cerca, con 50% de probabilidad."""
         if self.ticks_alive % 6 == 0:  # Cada 6 ticks
-            nearby_animals = []
-            for dx in [-1, 0, 1]:
+            # Animales vivos en el vecindario 3x3, sin contarse a sí mismo
+            nearby_animals = world.index.count('AnimalSmall', self.x, self.y) + world.index.count('AnimalBig', self.x, self.y)
+            if world.grid[self.y][self.x] is self:
+                nearby_animals -= 1
+
+            if nearby_animals > 0 and world.rng.random(REPRODUCE, self.id) < 0.5:
+                # La cría aparece en una celda libre del vecindario 3x3 (sin celdas libres no hay cría)
+                cells = []
                 for dy in [-1, 0, 1]:
-                    nx = self.x + dx
-                    ny = self.y + dy
-                    if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]):
-                        cell = grid[ny][nx]
-                        if hasattr(cell, 'size') and cell.size in ['small', 'big']:
-                            nearby_animals.append(cell)
-
-            if nearby_animals and random.random() < 0.5:
-                x, y = self.x, self.y
-                while grid[y][x] is not None:  # Buscar una celda vacía
-                    x = random.randint(0, len(grid[0]) - 1)
-                    y = random.randint(0, len(grid) - 1)
-                grid[y][x] = AnimalSmall(x, y)
+                    for dx in [-1, 0, 1]:
+                        nx, ny = self.x + dx, self.y + dy
+                        if 0 <= nx < world.width and 0 <= ny < world.height and ny * world.width + nx in world.empty_cells:
+                            cells.append((nx, ny))
+                if cells:
+                    world.spawn(world.create(AnimalSmall, *world.rng.choice(REPRODUCE, self.id, cells, draw=1)))
 
 class AnimalBig(AnimalSmall):
+    __slots__ = ()
+    kind = Kind.ANIMAL_BIG
+    FOOD = {Kind.PLANT_HIGH: 1, Kind.PLANT_LOW: 2, Kind.FUNGI: 2}  # 1 hp de PlantHigh o 2 de PlantLow/hongo
+
     def __init__(self, x, y):
         super().__init__(x, y)
-        self.size = 'big'
         self.hp = 10
-
-    def consume_plant(self, grid):
-        """Consume una planta aleatoria cerca del animal."""
-        plants_nearby = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx = self.x + dx
-                ny = self.y + dy
-                if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]):
-                    cell = grid[ny][nx]
-                    if hasattr(cell, 'plant_type') and cell.plant_type in ['low', 'high']:
-                        plants_nearby.append(cell)
-
-        if plants_nearby:
-            plant = random.choice(plants_nearby)
-            if plant.plant_type == 'high':
-                plant.energy -= 2  # Big consume 2 de PlantHigh
-            elif plant.plant_type == 'low':
-                plant.energy -= 1  # Big consume 1 de PlantLow
-            self.consecutive_ticks_without_consuming = 0  # Reiniciar contador de hambre
-        else:
-            self.consecutive_ticks_without_consuming += 1  # No encontró comida, aumenta hambre
\ No newline at end of file
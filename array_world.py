@@ -0,0 +1,438 @@
+#array_world.py
+import argparse
+import numpy as np
+from world import Engine, World, CELL_LABELS
+from rng import RandomStreams, new_seed, TERRAIN, POPULATE, MOVE, FEED, DEATH, REPRODUCE, GROW, SPAWN
+from rng import FUNGI as FUNGI_STREAM  # FUNGI es también el tipo de entidad
+import terrain
+from terrain import ROCK, SOIL, SOIL_PLUS, WATER, procedural
+
+# Tipos de entidad (capa `etype`)
+EMPTY, PLANT_LOW, PLANT_HIGH, ANIMAL_SMALL, ANIMAL_BIG, FUNGI = range(6)
+# Estados (capa `state`)
+LIVE, DEAD = 0, 1
+# Código de celda (world.CELL_LABELS) de cada tipo vivo; +1 si está muerto
+ETYPE_CODES = np.array([0, 5, 7, 9, 11, 13], dtype=np.uint8)
+# Ciclo de tierra: una PlantHigh degrada la celda y un hongo la enriquece
+DEGRADE = np.frombuffer(terrain.DEGRADE, dtype=np.uint8)
+ENRICH = np.frombuffer(terrain.ENRICH, dtype=np.uint8)
+
+# Capas del mundo y su tipo de dato (todas de width * height elementos)
+LAYERS = {
+    "terrain": np.uint8,  # Códigos de terrain.py
+    "etype": np.uint8,
+    "state": np.uint8,
+    "hp": np.int16,  # hp de animales y hongos, energía de plantas
+    "age": np.int16,
+    "hunger": np.uint8,  # Ticks consecutivos sin consumir
+    "corpse": np.uint8,  # Tipo de la entidad muerta bajo un hongo
+}
+
+# Desplazamientos de las direcciones (arriba, abajo, izquierda, derecha)
+DIR_X = np.array([0, 0, -1, 1])
+DIR_Y = np.array([-1, 1, 0, 0])
+
+
+class ArrayWorld(Engine):
+    """Motor alternativo: cada propiedad de las celdas es un array de NumPy y cada fase de reglas se aplica en bloque."""
+
+    def __init__(self, width=24, height=24, seed=None, layers=None, offset=0, terrain="minimal"):
+        """Con `layers` (dict nombre -> array) el mundo trabaja sobre arrays existentes y no genera terreno;
+        `offset` es el índice global de su primera celda cuando es una franja de un mundo mayor (ver tiled.py).
+        `terrain` es "minimal" (una casilla de cada recurso) o "procedural" (terrain.procedural, para mapas grandes).
+        """
+        super().__init__(width, height)
+        self.seed = new_seed() if seed is None else seed
+        # Sorteos por (tick, índice global de celda): el resultado no depende del orden de evaluación
+        self.rng = RandomStreams(self.seed)
+        self.offset = offset
+        self._before = None  # Códigos y terreno al inicio del tick, si se registran los cambios
+        self.phases = [
+            ("age", self._age),
+            ("move_animals", self._move_animals),
+            ("feed_animals", self._feed_animals),
+            ("grow_animals", self._grow_animals),
+            ("reproduce_animals", self._reproduce_animals),
+            ("promote_plants", self._promote_plants),
+            ("reproduce_plants", self._reproduce_plants),
+            ("grow_fungi", self._grow_fungi),
+            ("check_deaths", self._check_deaths),
+            ("spawn_fungi", self._spawn_fungi),
+        ]
+        # Todas las capas son planas: la celda (x, y) es el índice y * width + x
+        for name, dtype in LAYERS.items():
+            setattr(self, name, layers[name] if layers is not None else np.zeros(width * height, dtype=dtype))
+
+        if layers is None:
+            self.generate_terrain(terrain)
+
+    def save_checkpoint(self, path):
+        """Guarda las capas del mundo en un archivo binario (ver checkpoint.py)."""
+        from checkpoint import save_array_world
+        save_array_world(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Abre un checkpoint proyectado en memoria; las capas se leen del disco al usarse."""
+        from checkpoint import load_array_world
+        return load_array_world(path)
+
+    def fork(self, seed=None):
+        """Copia el mundo en memoria; con otra semilla sigue una continuación distinta."""
+        layers = {name: getattr(self, name).copy() for name in LAYERS}
+        other = ArrayWorld(self.width, self.height, seed=self.seed if seed is None else seed,
+                           layers=layers, offset=self.offset)
+        other.tick = self.tick
+        return other
+
+    def _random(self, stream, cells, draw=0, fan=None):
+        """Sorteo uniforme por celda (índices locales); con `fan`, `fan` sorteos por celda con forma (n, fan)."""
+        keys = cells + self.offset
+        if fan is not None:
+            keys = keys[:, None] * fan + np.arange(fan)
+        return self.rng.random_array(stream, keys, draw)
+
+    def _coords(self, cells):
+        """Coordenadas (x, y) de las celdas dentro de su mundo."""
+        return cells % self.width, cells // self.width % self.height
+
+    def _sample(self, stream, cells, k, draw=0):
+        """Elige hasta `k` celdas distintas de `cells` al azar (las de menor clave sorteada)."""
+        if k >= cells.size:
+            return cells
+        keys = self._random(stream, cells, draw)
+        return cells[np.sort(np.argpartition(keys, k)[:k])]
+
+    def generate_terrain(self, kind="minimal"):
+        """Genera el terreno inicial: "minimal" o "procedural" (ver terrain.procedural)."""
+        if kind == "procedural":
+            self.terrain[:] = procedural(self.width, self.height, self.rng)
+        elif kind == "minimal":
+            self.generate_initial_resources()
+        else:
+            raise ValueError(f"Terreno desconocido: {kind}")
+
+    def generate_initial_resources(self):
+        """Genera una casilla de cada tipo (rock, soil, soil+, water) en celdas distintas."""
+        cells = np.arange(self.terrain.size)
+        keys = self._random(TERRAIN, cells)
+        self.terrain[np.argsort(keys)[:4]] = [ROCK, SOIL, SOIL_PLUS, WATER]
+
+    def populate(self, num_plants, num_animals, num_fungi):
+        """Coloca las entidades iniciales en celdas libres elegidas al azar."""
+        soil = np.flatnonzero(((self.terrain == SOIL) | (self.terrain == SOIL_PLUS)) & (self.etype == EMPTY))
+        self._spawn(self._sample(POPULATE, soil, num_plants), PLANT_LOW, 5)
+        free = np.flatnonzero((self.etype == EMPTY) & (self.terrain != ROCK))
+        free = self._sample(POPULATE, free, num_animals + num_fungi, draw=1)
+        free = free[np.argsort(self._random(POPULATE, free, draw=2))]
+        self._spawn(free[:num_animals], ANIMAL_SMALL, 5)
+        self._spawn(free[num_animals:num_animals + num_fungi], FUNGI, 3)
+
+    def _spawn(self, cells, etype, hp):
+        """Crea entidades vivas nuevas en las celdas indicadas."""
+        self.etype[cells] = etype
+        self.state[cells] = LIVE
+        self.hp[cells] = hp
+        self.age[cells] = 0
+        self.hunger[cells] = 0
+
+    def _clear(self, cells):
+        """Vacía las celdas indicadas."""
+        self.etype[cells] = EMPTY
+        self.state[cells] = LIVE
+        self.hp[cells] = 0
+        self.age[cells] = 0
+        self.hunger[cells] = 0
+
+    def _neighbor_count(self, mask):
+        """Cuenta, para cada celda, cuántas celdas de su vecindario 3x3 cumplen `mask` (incluida ella)."""
+        grid = np.pad(mask.reshape(-1, self.height, self.width).astype(np.uint8), ((0, 0), (1, 1), (1, 1)))
+        total = np.zeros(grid.shape[:1] + (self.height, self.width), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                total += grid[:, dy:dy + self.height, dx:dx + self.width]
+        return total.ravel()
+
+    def _neighbors(self, cells):
+        """Devuelve (índices, válidos) del vecindario 3x3 de cada celda, con forma (n, 9)."""
+        dx = np.array([-1, 0, 1] * 3)
+        dy = np.repeat([-1, 0, 1], 3)
+        x, y = self._coords(cells)
+        x, y = x[:, None] + dx, y[:, None] + dy
+        valid = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        return np.where(valid, cells[:, None] + dy * self.width + dx, 0), valid
+
+    def _snapshot(self):
+        """Códigos y terreno actuales, para comparar con `_changed_since`."""
+        return self._codes(), self.terrain.copy()
+
+    def _changed_since(self, snapshot):
+        """Celdas cuyo código o terreno (también bajo una entidad) ha cambiado desde `snapshot`."""
+        codes, terrain = snapshot
+        return np.flatnonzero((codes != self._codes()) | (terrain != self.terrain)).tolist()
+
+    def begin_tick(self):
+        self._before = self._snapshot() if self.track_changes else None
+        self.rng.begin_tick(self.tick)
+
+    def end_tick(self):
+        if self._before is not None:
+            self.changed = self._changed_since(self._before)
+            self._before = None
+        self.tick += 1
+
+    def _age(self):
+        """Envejece un tick a todas las entidades vivas."""
+        live = (self.etype != EMPTY) & (self.state == LIVE)
+        self.age[live] += 1
+
+    def _move_animals(self):
+        """Mueve cada animal 1-3 celdas en una dirección aleatoria si el destino está libre y el camino abierto."""
+        cells = np.flatnonzero(((self.etype == ANIMAL_SMALL) | (self.etype == ANIMAL_BIG)) & (self.state == LIVE))
+        if cells.size == 0:
+            return
+
+        direction = (self._random(MOVE, cells) * 4).astype(np.intp)
+        distance = 1 + (self._random(MOVE, cells, draw=1) * 3).astype(np.intp)
+        dx, dy = DIR_X[direction] * distance, DIR_Y[direction] * distance
+        x, y = self._coords(cells)
+        ok = (x + dx >= 0) & (x + dx < self.width) & (y + dy >= 0) & (y + dy < self.height)
+        step = DIR_Y[direction] * self.width + DIR_X[direction]
+        target = np.where(ok, cells + distance * step, cells)
+
+        # Destino libre; cortan el camino la roca, entrar o salir del agua y las PlantHigh vivas
+        in_water = self.terrain[cells] == WATER
+        ok &= self.etype[target] == EMPTY
+        for s in range(1, 4):
+            along = ok & (s <= distance)
+            crossed = np.where(along, cells + s * step, cells)
+            terrain = self.terrain[crossed]
+            blocked = (terrain == ROCK) | ((terrain == WATER) != in_water)
+            blocked |= (self.etype[crossed] == PLANT_HIGH) & (self.state[crossed] == LIVE)
+            ok &= ~(along & blocked)
+
+        # Conflictos: si varios animales eligen la misma celda, gana el de menor índice
+        cells, target = cells[ok], target[ok]
+        _, first = np.unique(target, return_index=True)
+        cells, target = cells[first], target[first]
+
+        for layer in (self.etype, self.state, self.hp, self.age, self.hunger):
+            layer[target] = layer[cells]
+        self._clear(cells)
+
+    def _feed_animals(self):
+        """Cada animal consume de una planta u hongo aleatorio a su alrededor; si no, aumenta su hambre."""
+        cells = np.flatnonzero(((self.etype == ANIMAL_SMALL) | (self.etype == ANIMAL_BIG)) & (self.state == LIVE))
+        if cells.size == 0:
+            return
+
+        neighbors, valid = self._neighbors(cells)
+        kind = self.etype[neighbors]
+        big = (self.etype[cells] == ANIMAL_BIG)[:, None]
+        edible = valid & (self.state[neighbors] == LIVE) & (
+            (kind == PLANT_LOW) | (kind == FUNGI) | (big & (kind == PLANT_HIGH)))
+
+        keys = np.where(edible, self._random(FEED, cells, fan=9), -1.0)
+        choice = neighbors[np.arange(cells.size), keys.argmax(axis=1)]
+        fed = edible.any(axis=1)
+
+        # [big]: 1 hp de plant-high o 2 hp de plant-low/fungi; [small]: 1 hp
+        bite = np.where(big[:, 0], np.where(self.etype[choice] == PLANT_HIGH, 1, 2), 1)
+        np.subtract.at(self.hp, choice[fed], bite[fed].astype(np.int16))
+        self.hunger[cells[fed]] = 0
+        self.hunger[cells[~fed]] += 1
+
+    def _grow_animals(self):
+        """A los 12 ticks un animal pequeño se convierte en grande."""
+        grown = (self.etype == ANIMAL_SMALL) & (self.state == LIVE) & (self.age >= 12)
+        self.etype[grown] = ANIMAL_BIG
+        self.hp[grown] = 10
+
+    def _reproduce_animals(self):
+        """Cada 6 ticks, un animal con otro al lado tiene 50% de generar un animal pequeño en una celda libre a su lado."""
+        animals = ((self.etype == ANIMAL_SMALL) | (self.etype == ANIMAL_BIG)) & (self.state == LIVE)
+        mates = self._neighbor_count(animals) - 1  # Sin contarse a sí mismo
+        cells = np.flatnonzero(animals & (self.age % 6 == 0) & (mates > 0))
+        cells = cells[self._random(REPRODUCE, cells) < 0.5]
+        if cells.size == 0:
+            return
+
+        # La cría aparece en el vecindario 3x3 del progenitor: así la regla es local (ver tiled.py)
+        neighbors, valid = self._neighbors(cells)
+        valid &= (self.etype[neighbors] == EMPTY) & (self.terrain[neighbors] != ROCK)
+        keys = np.where(valid, self._random(REPRODUCE, cells, draw=1, fan=9), -1.0)
+        target = neighbors[np.arange(cells.size), keys.argmax(axis=1)][valid.any(axis=1)]
+        self._spawn(np.unique(target), ANIMAL_SMALL, 5)
+
+    def _promote_plants(self):
+        """Una plant-low se convierte en plant-high tras 24 ticks, o 16 sobre soil+."""
+        low = (self.etype == PLANT_LOW) & (self.state == LIVE)
+        promoted = low & ((self.age >= 24) | ((self.age >= 16) & (self.terrain == SOIL_PLUS)))
+        self.etype[promoted] = PLANT_HIGH
+
+    def _reproduce_plants(self):
+        """Cada 8 ticks, 30% de generar una plant-low en una celda vecina libre."""
+        plants = ((self.etype == PLANT_LOW) | (self.etype == PLANT_HIGH)) & (self.state == LIVE) & (self.age % 8 == 0)
+        cells = np.flatnonzero(plants)
+        cells = cells[self._random(GROW, cells) < 0.3]
+        if cells.size == 0:
+            return
+
+        x, y = self._coords(cells)
+        nx, ny = x[:, None] + DIR_X, y[:, None] + DIR_Y
+        valid = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+        target = np.where(valid, cells[:, None] + DIR_Y * self.width + DIR_X, 0)
+        valid &= (self.etype[target] == EMPTY) & (self.terrain[target] != ROCK)
+
+        keys = np.where(valid, self._random(GROW, cells, draw=1, fan=4), -1.0)
+        target = target[np.arange(cells.size), keys.argmax(axis=1)][valid.any(axis=1)]
+        self._spawn(np.unique(target), PLANT_LOW, 5)
+
+    def _grow_fungi(self):
+        """Cada 2 ticks un hongo sobre un cadáver gana 1 hp y tiene 20% de removerlo (enriquece la tierra)."""
+        active = (self.etype == FUNGI) & (self.state == LIVE) & (self.corpse != EMPTY) & (self.age % 2 == 0)
+        self.hp[active] += 1
+        cells = np.flatnonzero(active)
+        cleared = cells[self._random(FUNGI_STREAM, cells) < 0.2]
+        self.corpse[cleared] = EMPTY
+        self.terrain[cleared] = ENRICH[self.terrain[cleared]]
+
+    def _check_deaths(self):
+        """Aplica las muertes por edad, hambre o falta de hp."""
+        live = self.state == LIVE
+        etype = self.etype
+
+        # Vida máxima: 24 +/- 1 ticks para animales, 30 +/- 3 para plantas
+        cells = np.flatnonzero(live & ((etype == ANIMAL_SMALL) | (etype == ANIMAL_BIG)))
+        lifespan = 23 + (self._random(DEATH, cells) * 3).astype(np.int16)
+        dead_animals = cells[(self.age[cells] >= lifespan) | (self.hunger[cells] >= 3)]
+
+        cells = np.flatnonzero(live & ((etype == PLANT_LOW) | (etype == PLANT_HIGH)))
+        lifespan = 27 + (self._random(DEATH, cells) * 7).astype(np.int16)
+        dead_plants = cells[(self.age[cells] >= lifespan) | (self.hp[cells] <= 0)]
+        # Al morir una plant-high degrada la celda en el ciclo de tierra
+        degraded = dead_plants[etype[dead_plants] == PLANT_HIGH]
+        self.terrain[degraded] = DEGRADE[self.terrain[degraded]]
+
+        self.state[dead_animals] = DEAD
+        self.state[dead_plants] = DEAD
+
+        # Un hongo sin hp es removido; si había un cadáver debajo, vuelve a quedar expuesto
+        gone = np.flatnonzero(live & (etype == FUNGI) & (self.hp <= 0))
+        corpses = self.corpse[gone]
+        self._clear(gone)
+        buried = gone[corpses != EMPTY]
+        self.etype[buried] = corpses[corpses != EMPTY]
+        self.state[buried] = DEAD
+        self.corpse[gone] = EMPTY
+
+    def _spawn_fungi(self):
+        """Cada cadáver tiene 10% de posibilidad de hacer aparecer un hongo sobre él."""
+        cells = np.flatnonzero(self.state == DEAD)
+        cells = cells[self._random(SPAWN, cells) < 0.1]
+        self.corpse[cells] = self.etype[cells]
+        self._spawn(cells, FUNGI, 3)
+
+    def population_counts(self):
+        """Entidades vivas de cada tipo, en el orden de world.POPULATION_KINDS."""
+        counts = np.bincount(self.etype[self.state == LIVE], minlength=6)
+        return tuple(int(n) for n in counts[1:])
+
+    def _codes(self, cells=slice(None)):
+        """Array uint8 con los códigos (ver world.CELL_LABELS) de las celdas indicadas."""
+        etype = self.etype[cells]
+        return np.where(etype != EMPTY, ETYPE_CODES[etype] + self.state[cells], self.terrain[cells]).astype(np.uint8)
+
+    def get_grid_codes(self):
+        """Devuelve la cuadrícula como códigos enteros (ver world.CELL_LABELS)."""
+        return bytearray(self._codes().tobytes())
+
+    def get_cell_codes(self, cells):
+        """Códigos de las celdas indicadas por índice."""
+        return self._codes(np.asarray(cells, dtype=np.intp)).tolist()
+
+    def get_grid_state(self):
+        """Devuelve el estado actual de la cuadrícula como una lista de listas."""
+        codes = self.get_grid_codes()
+        width = self.width
+        return [[CELL_LABELS[code] for code in codes[y * width:(y + 1) * width]] for y in range(self.height)]
+
+
+def population(codes):
+    """Cuenta las celdas de cada etiqueta de entidad viva en un buffer de códigos."""
+    return {CELL_LABELS[code]: codes.count(code) for code in ETYPE_CODES[1:]}
+
+
+def compare_engines(seeds, ticks, width=24, height=24, num_plants=1, num_animals=1, num_fungi=1, terrain="minimal"):
+    """Compara la población media por tipo y tick del motor de objetos y del motor de arrays.
+
+    Con `terrain="procedural"` hay agua, rocas y tierra repartidas por todo el mapa: es el
+    escenario en el que sobreviven los cinco tipos y se ejercitan todas las reglas.
+
+    Devuelve {etiqueta: (medias_world, medias_array)}, cada una con ticks + 1 valores.
+    """
+    labels = [CELL_LABELS[code] for code in ETYPE_CODES[1:]]
+    totals = {"world": {label: [0] * (ticks + 1) for label in labels},
+              "array": {label: [0] * (ticks + 1) for label in labels}}
+
+    for seed in seeds:
+        engines = {"world": World(width, height, seed=seed, terrain=terrain),
+                   "array": ArrayWorld(width, height, seed=seed, terrain=terrain)}
+        for name, engine in engines.items():
+            engine.populate(num_plants, num_animals, num_fungi)
+            for tick in range(ticks + 1):
+                for label, count in population(engine.get_grid_codes()).items():
+                    totals[name][label][tick] += count
+                engine.update()
+
+    runs = len(seeds)
+    return {label: ([n / runs for n in totals["world"][label]], [n / runs for n in totals["array"][label]])
+            for label in labels}
+
+
+def max_relative_difference(world_means, array_means, floor=10.0):
+    """Mayor diferencia entre dos series de medias relativa a la mayor de ellas en cada tick.
+
+    Por debajo de `floor` entidades la diferencia se mide respecto a `floor`: con pocas
+    entidades el ruido entre semillas domina y una diferencia relativa no significa nada.
+    """
+    return max(abs(a - b) / max(a, b, floor) for a, b in zip(world_means, array_means))
+
+
+def total_relative_difference(world_means, array_means):
+    """Diferencia relativa de la población acumulada en todos los ticks (mucho menos ruidosa que tick a tick)."""
+    world_total, array_total = sum(world_means), sum(array_means)
+    return abs(world_total - array_total) / max(world_total, array_total, 1.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara estadísticamente el motor de objetos y el de arrays.")
+    parser.add_argument("--runs", type=int, default=100, help="número de semillas")
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--width", type=int, default=48)
+    parser.add_argument("--height", type=int, default=48)
+    parser.add_argument("--plants", type=int, default=300)
+    parser.add_argument("--animals", type=int, default=150)
+    parser.add_argument("--fungi", type=int, default=30)
+    parser.add_argument("--terrain", choices=["minimal", "procedural"], default="procedural")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="diferencia relativa máxima aceptada en cada tick (ver max_relative_difference)")
+    parser.add_argument("--total-tolerance", type=float, default=0.08,
+                        help="diferencia relativa máxima aceptada en la población acumulada")
+    args = parser.parse_args(argv)
+
+    result = compare_engines(range(args.runs), args.ticks, args.width, args.height,
+                             args.plants, args.animals, args.fungi, args.terrain)
+    ok = True
+    for label, (world_means, array_means) in result.items():
+        diff = max_relative_difference(world_means, array_means)
+        total = total_relative_difference(world_means, array_means)
+        same = diff <= args.tolerance and total <= args.total_tolerance
+        ok &= same
+        print(f"{label:12s} world={world_means[-1]:7.2f} array={array_means[-1]:7.2f} "
+              f"max_dif={diff:6.1%} dif_total={total:6.1%} {'ok' if same else 'DIFERENTE'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
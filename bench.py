@@ -0,0 +1,167 @@
+#bench.py
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from rng import POPULATE
+
+SIZES = (24, 64, 256, 1024)  # Por defecto; 2048 y 4096 se piden con --sizes (World tarda minutos por tick)
+# Fracción de celdas ocupadas por cada tipo de entidad en cada escenario ("dead" = cadáver de AnimalSmall)
+SCENARIOS = {
+    "empty": {},
+    "plants": {"PlantLow": 0.6, "PlantHigh": 0.3},
+    "animals": {"AnimalSmall": 0.2, "AnimalBig": 0.05, "PlantLow": 0.2},
+    "corpses": {"dead": 0.3, "Fungi": 0.05},
+}
+SCENARIO_DRAW = 7  # Sorteo del flujo POPULATE reservado para colocar los escenarios
+TICK_BUDGET = 2_000_000  # Celdas * ticks por caso: los mapas grandes corren menos ticks
+
+
+def _scenario_cells(world, densities):
+    """Asigna a cada celda libre un tipo del escenario (o ninguno) con un sorteo por celda."""
+    import numpy as np
+
+    u = world.rng.random_array(POPULATE, np.arange(world.width * world.height), draw=SCENARIO_DRAW)
+    bounds = np.cumsum(list(densities.values()))
+    choice = np.searchsorted(bounds, u, side="right")
+    return {name: np.flatnonzero(choice == k) for k, name in enumerate(densities)}
+
+
+def build(engine, scenario, size, seed=0):
+    """Crea un mundo `size` x `size` con el escenario indicado, siempre igual para la misma semilla."""
+    densities = SCENARIOS[scenario]
+    if engine == "array":
+        from array_world import ArrayWorld, ROCK, WATER, EMPTY, DEAD, PLANT_LOW, PLANT_HIGH, \
+            ANIMAL_SMALL, ANIMAL_BIG, FUNGI
+
+        world = ArrayWorld(size, size, seed=seed)
+        etypes = {"PlantLow": (PLANT_LOW, 5), "PlantHigh": (PLANT_HIGH, 5), "AnimalSmall": (ANIMAL_SMALL, 5),
+                  "AnimalBig": (ANIMAL_BIG, 10), "Fungi": (FUNGI, 3), "dead": (ANIMAL_SMALL, 0)}
+        for name, cells in _scenario_cells(world, densities).items():
+            cells = cells[(world.etype[cells] == EMPTY) & (world.terrain[cells] != ROCK) & (world.terrain[cells] != WATER)]
+            etype, hp = etypes[name]
+            world._spawn(cells, etype, hp)
+            if name == "dead":
+                world.state[cells] = DEAD
+        return world
+
+    from world import World
+    from event_world import EventWorld
+    from animal import AnimalSmall, AnimalBig
+    from plant import PlantLow, PlantHigh
+    from fungi import Fungi
+    from entity import DEAD
+
+    world = (EventWorld if engine == "event" else World)(size, size, seed=seed)
+    classes = {"PlantLow": PlantLow, "PlantHigh": PlantHigh, "AnimalSmall": AnimalSmall, "AnimalBig": AnimalBig,
+               "Fungi": Fungi, "dead": AnimalSmall}
+    for name, cells in _scenario_cells(world, densities).items():
+        for i in cells.tolist():
+            entity = classes[name](i % size, i // size)
+            if name == "dead":
+                entity.state = DEAD
+            world.add_entity(entity)  # Sólo se coloca en celdas libres que no son roca
+    world.changed = set()
+    return world
+
+
+def run_case(engine, scenario, size, ticks, seed=0):
+    """Mide un caso en un proceso propio (así el pico de memoria es sólo suyo)."""
+    start = time.perf_counter()
+    world = build(engine, scenario, size, seed)
+    build_seconds = time.perf_counter() - start
+
+    world.update()  # Calentamiento
+    world.phase_times = {}
+    start = time.perf_counter()
+    for _ in range(ticks):
+        world.update()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_kib = peak // 1024 if sys.platform == "darwin" else peak
+    return {
+        "engine": engine,
+        "scenario": scenario,
+        "size": size,
+        "ticks": ticks,
+        "ticks_per_sec": ticks / elapsed,
+        "build_seconds": build_seconds,
+        "phase_seconds_per_tick": {name: t / ticks for name, t in world.phase_times.items()},
+        "peak_rss_kib": peak_kib,
+    }
+
+
+def case_key(result):
+    return f"{result['engine']}/{result['scenario']}/{result['size']}"
+
+
+def run_suite(engines, scenarios, sizes, max_ticks, seed=0, repeat=3, progress=print):
+    """Ejecuta cada combinación `repeat` veces, cada una en un proceso nuevo, y se queda con la más rápida."""
+    results = []
+    context = mp.get_context("spawn")  # Procesos limpios: sin memoria heredada del padre
+    for engine in engines:
+        for scenario in scenarios:
+            for size in sizes:
+                ticks = max(2, min(max_ticks, TICK_BUDGET // (size * size)))
+                runs = []
+                for _ in range(repeat):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        runs.append(executor.submit(run_case, engine, scenario, size, ticks, seed).result())
+                # La corrida más rápida es la menos afectada por otros procesos de la máquina
+                result = max(runs, key=lambda r: r["ticks_per_sec"])
+                result["peak_rss_kib"] = max(r["peak_rss_kib"] for r in runs)
+                results.append(result)
+                progress(f"{case_key(result):28s} {result['ticks_per_sec']:10.2f} ticks/s "
+                         f"{result['peak_rss_kib'] / 1024:9.1f} MiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Devuelve [(caso, ticks/s base, ticks/s actual)] de los casos más lentos que la base en más de `threshold`."""
+    reference = {case_key(r): r["ticks_per_sec"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = reference.get(case_key(result))
+        if base is not None and result["ticks_per_sec"] < base * (1 - threshold):
+            regressions.append((case_key(result), base, result["ticks_per_sec"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de World.update por escenario y tamaño de mapa.")
+    parser.add_argument("--engine", nargs="+", choices=["world", "event", "array"], default=["world"])
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="lados del mapa cuadrado (24 a 4096)")
+    parser.add_argument("--ticks", type=int, default=50, help="ticks máximos por caso (menos en mapas grandes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="corridas por caso (se guarda la más rápida)")
+    parser.add_argument("--output", default="bench.json", help="archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="resultados anteriores con los que comparar")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="caída de ticks/s tolerada frente a la base (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.engine, args.scenario, args.sizes, args.ticks, args.seed, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=1)
+    print(f"Resultados guardados en '{args.output}'.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for key, base, rate in regressions:
+            print(f"REGRESIÓN {key}: {base:.2f} -> {rate:.2f} ticks/s ({rate / base - 1:+.1%})")
+        if regressions:
+            return 1
+        print(f"Sin regresiones (umbral {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
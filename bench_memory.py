@@ -0,0 +1,41 @@
+#bench_memory.py
+import argparse
+import gc
+import tracemalloc
+from animal import AnimalSmall, AnimalBig
+from plant import PlantLow, PlantHigh
+from fungi import Fungi
+from registry import EntityStore
+
+CLASSES = [AnimalSmall, AnimalBig, PlantLow, PlantHigh, Fungi]
+
+
+def bytes_per_entity(cls, count, registered=False):
+    """Mide la memoria media que ocupa cada entidad de `cls` (objeto y atributos)."""
+    gc.collect()
+    store = EntityStore() if registered else None
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [cls(i % 4096, i // 4096) for i in range(count)]
+    if store is not None:
+        for entity in entities:
+            store.add(entity)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Se descuenta la lista que sostiene los objetos (un puntero por entidad)
+    return (after - before) / count - 8
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes por entidad de cada clase.")
+    parser.add_argument("--count", type=int, default=200_000, help="entidades creadas por clase")
+    parser.add_argument("--registered", action="store_true", help="incluir el coste del registro de entidades")
+    args = parser.parse_args(argv)
+
+    for cls in CLASSES:
+        size = bytes_per_entity(cls, args.count, args.registered)
+        print(f"{cls.__name__:12s} {size:8.1f} bytes/entidad")
+
+
+if __name__ == "__main__":
+    main()
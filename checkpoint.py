@@ -0,0 +1,225 @@
+#checkpoint.py
+import mmap
+import struct
+from array import array
+from animal import AnimalSmall, AnimalBig
+from plant import PlantLow, PlantHigh
+from fungi import Fungi
+from entity import Kind
+from stats import COUNTERS
+
+# Formato de checkpoint (binario, little-endian):
+#   cabecera: MAGIC, versión, motor, ancho, alto, tick, semilla y tamaños de las secciones
+#   World:      terreno (1 byte por celda), generaciones de slots, slots libres, entidades,
+#               las celdas libres y de tierra libre en el orden de sus índices, los hongos
+#               programados sobre cadáveres (tick, id del cadáver) y los contadores de
+#               stats.COUNTERS (uno por tipo de entity.Kind)
+#   EventWorld: lo mismo que World seguido de la rueda de eventos (tick, id, edad), la vida
+#               máxima de cada entidad (id, edad) y los ids de los animales en orden de nacimiento
+#   ArrayWorld: cada capa de array_world.LAYERS en bruto
+# Los generadores son por contadores (rng.py): semilla + tick bastan como estado aleatorio.
+MAGIC = b"VCKP"
+VERSION = 1
+COUNT = struct.Struct("<I")
+HEADER = struct.Struct("<4sBBIIQQIII")
+ENGINE_WORLD, ENGINE_ARRAY, ENGINE_EVENT = 0, 1, 2
+# tipo, estado, x, y, hp/energía, ticks vivos, ticks sin consumir (animales) o cadáver debajo (hongos), id
+ENTITY = struct.Struct("<BBIIiiiQ")
+SPAWN = struct.Struct("<QQ")
+EVENT = struct.Struct("<QQI")
+LIFESPAN = struct.Struct("<QI")
+MOVER = struct.Struct("<Q")
+COUNTER = struct.Struct(f"<{len(Kind)}q")
+CLASSES = {Kind.PLANT_LOW: PlantLow, Kind.PLANT_HIGH: PlantHigh, Kind.ANIMAL_SMALL: AnimalSmall,
+           Kind.ANIMAL_BIG: AnimalBig, Kind.FUNGI: Fungi}
+SEED_MASK = (1 << 64) - 1
+
+
+def _energy(entity):
+    return entity.energy if entity.kind in (Kind.PLANT_LOW, Kind.PLANT_HIGH) else entity.hp
+
+
+def _extra(entity):
+    if entity.kind == Kind.FUNGI:
+        return entity.corpse
+    return getattr(entity, 'consecutive_ticks_without_consuming', 0)
+
+
+def _write_section(f, records, layout):
+    """Escribe el número de registros y cada registro empaquetado con `layout`."""
+    f.write(COUNT.pack(len(records)))
+    for record in records:
+        f.write(layout.pack(*record))
+
+
+def _read_section(mm, offset, layout):
+    """Lee una sección escrita con _write_section; devuelve (registros, posición siguiente)."""
+    size, = COUNT.unpack_from(mm, offset)
+    offset += COUNT.size
+    return list(layout.iter_unpack(mm[offset:offset + size * layout.size])), offset + size * layout.size
+
+
+def save_world(world, path):
+    """Guarda un World (terreno, entidades, registro y estado aleatorio)."""
+    with open(path, "wb") as f:
+        _write_world(f, world, ENGINE_WORLD)
+
+
+def save_event_world(world, path):
+    """Guarda un EventWorld: el estado de World más la rueda de eventos y las vidas sorteadas."""
+    with open(path, "wb") as f:
+        _write_world(f, world, ENGINE_EVENT)
+        # Orden de la rueda y de los animales: decide el orden en que actúan las entidades
+        _write_section(f, [(due, entity_id, age) for due, (entity_id, age) in world.wheel.items()], EVENT)
+        _write_section(f, list(world.lifespans.items()), LIFESPAN)
+        _write_section(f, [(entity_id,) for entity_id in world.movers], MOVER)
+
+
+def _write_world(f, world, engine):
+    store = world.entities
+    f.write(HEADER.pack(MAGIC, VERSION, engine, world.width, world.height, world.tick,
+                        world.seed & SEED_MASK, len(store), len(store.slots), len(store.free)))
+    f.write(world.terrain)
+    f.write(array('I', store.generations).tobytes())
+    f.write(array('I', store.free).tobytes())
+    # Las entidades se guardan en el orden del registro: es el orden en que ejecutan su tick
+    for entity in store.dense:
+        f.write(ENTITY.pack(entity.kind, entity.state, entity.x, entity.y, _energy(entity), entity.ticks_alive,
+                            _extra(entity), entity.id))
+    # El orden interno de los conjuntos decide qué celda sale en cada sorteo
+    for cells in (world.empty_cells, world.free_soil):
+        f.write(COUNT.pack(len(cells)))
+        f.write(cells.cells.tobytes())
+    # Orden de la rueda: al volver a programarlos se reconstruye igual (ver TimingWheel.items)
+    _write_section(f, list(world.spawn_wheel.items()), SPAWN)
+    # Los eventos acumulados continúan desde el checkpoint, igual que en fork()
+    _write_section(f, [getattr(world.stats, name) for name in COUNTERS], COUNTER)
+
+
+def _read_header(mm, path):
+    magic, version, engine, width, height, tick, seed, *sizes = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es un checkpoint de la simulación.")
+    if version != VERSION:
+        raise ValueError(f"Versión de checkpoint no soportada: {version}")
+    return engine, width, height, tick, seed, sizes
+
+
+def load_world(path):
+    """Reconstruye un World guardado con save_world."""
+    from world import World
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        world, _ = _read_world(mm, path, World, ENGINE_WORLD)
+    return world
+
+
+def load_event_world(path):
+    """Reconstruye un EventWorld guardado con save_event_world."""
+    from event_world import EventWorld
+    from scheduler import TimingWheel
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        world, offset = _read_world(mm, path, EventWorld, ENGINE_EVENT)
+        events, offset = _read_section(mm, offset, EVENT)
+        lifespans, offset = _read_section(mm, offset, LIFESPAN)
+        movers, offset = _read_section(mm, offset, MOVER)
+    world.wheel = TimingWheel(world.tick)
+    for due, entity_id, age in events:
+        world.wheel.schedule(due, (entity_id, age))
+    world.lifespans = dict(lifespans)
+    world.movers = {entity_id: world.entities.get(entity_id) for entity_id, in movers}
+    world.birth_tick = world.tick  # Entre ticks vale tick (lo fija begin_tick)
+    return world
+
+
+def _read_world(mm, path, cls, expected):
+    """Reconstruye el estado de World de un checkpoint en un mundo de la clase `cls`; devuelve (mundo, posición)."""
+    from entity import State
+    from scheduler import TimingWheel
+
+    engine, width, height, tick, seed, (count, slots, free) = _read_header(mm, path)
+    if engine != expected:
+        raise ValueError(f"{path} no es un checkpoint de {cls.__name__}.")
+
+    world = cls(width, height, seed=seed, generate=False)
+    world.tick = tick
+    offset = HEADER.size
+    world.reset_terrain(mm[offset:offset + width * height])
+    offset += width * height
+
+    store = world.entities
+    store.generations = array('I', mm[offset:offset + 4 * slots]).tolist()
+    offset += 4 * slots
+    store.free = array('I', mm[offset:offset + 4 * free]).tolist()
+    offset += 4 * free
+    store.slots = [None] * slots
+
+    entities = mm[offset:offset + count * ENTITY.size]
+    offset += count * ENTITY.size
+    for kind, state, x, y, energy, ticks_alive, extra, entity_id in ENTITY.iter_unpack(entities):
+        entity_class = CLASSES[kind]
+        entity = entity_class.__new__(entity_class)
+        entity.x, entity.y = x, y
+        entity.state = State(state)
+        entity.ticks_alive = ticks_alive
+        if kind in (Kind.PLANT_LOW, Kind.PLANT_HIGH):
+            entity.energy = energy
+        else:
+            entity.hp = energy
+        if kind in (Kind.ANIMAL_SMALL, Kind.ANIMAL_BIG):
+            entity.consecutive_ticks_without_consuming = extra
+        elif kind == Kind.FUNGI:
+            entity.corpse = Kind(extra)
+        store.restore(entity, entity_id)
+        world.set_cell(x, y, entity)
+
+    # El orden interno de los conjuntos guardados decide qué celda sale en cada sorteo
+    for cells in (world.empty_cells, world.free_soil):
+        size, = COUNT.unpack_from(mm, offset)
+        offset += COUNT.size
+        cells.reset(mm[offset:offset + 4 * size])
+        offset += 4 * size
+
+    world.spawn_wheel = TimingWheel(tick)
+    spawns, offset = _read_section(mm, offset, SPAWN)
+    for due, corpse_id in spawns:
+        world.spawn_wheel.schedule(due, corpse_id)
+    counters, offset = _read_section(mm, offset, COUNTER)
+    for name, counter in zip(COUNTERS, counters):
+        setattr(world.stats, name, list(counter))
+    world.changed = set()
+    return world, offset
+
+
+def save_array_world(world, path):
+    """Guarda un ArrayWorld: cabecera y cada capa en bruto."""
+    from array_world import LAYERS
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, ENGINE_ARRAY, world.width, world.height, world.tick,
+                            world.seed & SEED_MASK, 0, 0, 0))
+        for name in LAYERS:
+            f.write(getattr(world, name).tobytes())
+
+
+def load_array_world(path):
+    """Abre un ArrayWorld guardado proyectando sus capas en memoria (copia al escribir)."""
+    import numpy as np
+    from array_world import ArrayWorld, LAYERS
+
+    with open(path, "rb") as f:
+        # ACCESS_COPY: las páginas se leen al usarse y las escrituras no tocan el archivo
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    engine, width, height, tick, seed, _ = _read_header(mm, path)
+    if engine != ENGINE_ARRAY:
+        raise ValueError(f"{path} no es un checkpoint de ArrayWorld.")
+
+    layers = {}
+    offset = HEADER.size
+    for name, dtype in LAYERS.items():
+        layers[name] = np.frombuffer(mm, dtype=dtype, count=width * height, offset=offset)
+        offset += layers[name].nbytes
+    world = ArrayWorld(width, height, seed=seed, layers=layers)
+    world.tick = tick
+    return world
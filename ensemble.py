@@ -0,0 +1,159 @@
+#ensemble.py
+import argparse
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from world import World, POPULATION_KINDS
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+ENGINES = ("world", "array", "event")  # Motores que crea make_engine
+
+
+def make_engine(engine, seed, width, height):
+    """Crea un mundo del motor pedido con sus propios flujos aleatorios sembrados con `seed`."""
+    if engine == "array":
+        from array_world import ArrayWorld
+        return ArrayWorld(width, height, seed=seed)
+    if engine == "event":
+        from event_world import EventWorld
+        return EventWorld(width, height, seed=seed)
+    return World(width, height, seed=seed)
+
+
+def run_one(seed, config):
+    """Ejecuta una corrida y devuelve sus contadores de población por tick.
+
+    El resultado es un array('I') plano de (ticks + 1) * len(POPULATION_KINDS) valores.
+    """
+    world = make_engine(config["engine"], seed, config["width"], config["height"])
+    world.populate(config["plants"], config["animals"], config["fungi"])
+    counts = array('I', world.population_counts())
+    for _ in range(config["ticks"]):
+        world.update()
+        counts.extend(world.population_counts())
+    return counts
+
+
+def run_chunk(seeds, config):
+    """Ejecuta un bloque de semillas en un proceso de trabajo."""
+    return [(seed, run_one(seed, config).tobytes()) for seed in seeds]
+
+
+def _quantile(histogram, rank):
+    """Valor en la posición `rank` (desde 0) de las corridas ordenadas, dado su histograma ordenado (valor, corridas)."""
+    for value, runs in histogram:
+        rank -= runs
+        if rank < 0:
+            return value
+    return histogram[-1][0]
+
+
+class EnsembleStats:
+    """Reduce los contadores de muchas corridas en medias, cuantiles e histogramas de extinción."""
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.kinds = len(POPULATION_KINDS)
+        self.runs = 0
+        self.sums = [0] * ((ticks + 1) * self.kinds)
+        # Histograma de cada tick y tipo (valor -> corridas) para los cuantiles: la memoria no crece con las corridas
+        self.histograms = [{} for _ in range((ticks + 1) * self.kinds)]
+        # Tick en que empieza la racha final sin entidades vivas del tipo (hasta el último tick)
+        # -> número de corridas; None = no se extinguió (vivo al final, aunque pasara por 0)
+        self.extinction = [{} for _ in POPULATION_KINDS]
+        self.absent = [0] * self.kinds  # Corridas en las que el tipo no llegó a aparecer
+
+    def add(self, counts):
+        """Incorpora los contadores de una corrida."""
+        self.runs += 1
+        sums, histograms = self.sums, self.histograms
+        for i, n in enumerate(counts):
+            sums[i] += n
+            histograms[i][n] = histograms[i].get(n, 0) + 1
+
+        for k in range(self.kinds):
+            series = counts[k::self.kinds]
+            last = next((t for t in range(self.ticks, -1, -1) if series[t]), None)  # Último tick con vivos
+            if last is None:
+                self.absent[k] += 1  # Un tipo que nunca estuvo vivo no se extingue
+                continue
+            # PlantHigh, AnimalBig y Fungi pueden volver tras pasar por 0: sólo cuenta la racha final
+            tick = last + 1 if last < self.ticks else None
+            self.extinction[k][tick] = self.extinction[k].get(tick, 0) + 1
+
+    def summary(self):
+        """Devuelve un diccionario serializable con los resultados agregados."""
+        result = {"runs": self.runs, "ticks": self.ticks, "kinds": {}}
+        for k, name in enumerate(POPULATION_KINDS):
+            means = [self.sums[t * self.kinds + k] / self.runs for t in range(self.ticks + 1)]
+            quantiles = {str(q): [] for q in QUANTILES}
+            for t in range(self.ticks + 1):
+                values = sorted(self.histograms[t * self.kinds + k].items())
+                for q in QUANTILES:
+                    quantiles[str(q)].append(_quantile(values, min(self.runs - 1, int(q * self.runs))))
+
+            histogram = self.extinction[k]
+            appeared = self.runs - self.absent[k]
+            extinct = appeared - histogram.get(None, 0)
+            result["kinds"][name] = {
+                "mean": means,
+                "quantiles": quantiles,
+                # Sobre las corridas en las que el tipo llegó a aparecer
+                "extinction_probability": extinct / appeared if appeared else 0.0,
+                "never_appeared": self.absent[k],
+                "extinction_ticks": {("never" if t is None else str(t)): n
+                                     for t, n in sorted(histogram.items(), key=lambda item: (item[0] is None, item[0] or 0))},
+            }
+        return result
+
+
+def run_ensemble(seeds, config, workers=None, chunk_size=None):
+    """Reparte las semillas entre procesos y devuelve las estadísticas agregadas."""
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    # Bloques grandes amortizan el coste de enviar tareas; varios por proceso equilibran la carga
+    chunk_size = chunk_size or max(1, len(seeds) // (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+    stats = EnsembleStats(config["ticks"])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_chunk, chunk, config) for chunk in chunks]
+        for future in as_completed(futures):
+            for _, data in future.result():
+                counts = array('I')
+                counts.frombytes(data)
+                stats.add(counts)
+    return stats.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta muchas corridas en paralelo y agrega sus estadísticas.")
+    parser.add_argument("--runs", type=int, default=1000, help="número de corridas (semillas)")
+    parser.add_argument("--seed-start", type=int, default=0, help="primera semilla")
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--width", type=int, default=24)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--plants", type=int, default=1)
+    parser.add_argument("--animals", type=int, default=1)
+    parser.add_argument("--fungi", type=int, default=1)
+    parser.add_argument("--engine", choices=ENGINES, default="world")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="semillas por tarea")
+    parser.add_argument("--output", default="ensemble.json", help="archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    config = {"engine": args.engine, "ticks": args.ticks, "width": args.width, "height": args.height,
+              "plants": args.plants, "animals": args.animals, "fungi": args.fungi}
+    summary = run_ensemble(range(args.seed_start, args.seed_start + args.runs), config, args.workers, args.chunk_size)
+    with open(args.output, "w") as f:
+        json.dump(summary, f)
+
+    for name, data in summary["kinds"].items():
+        print(f"{name:12s} media final={data['mean'][-1]:8.2f} P(extinción)={data['extinction_probability']:.3f}"
+              f" sin aparecer={data['never_appeared']}")
+    print(f"Resultados guardados en '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#entity.py
+from enum import IntEnum
+
+
+class State(IntEnum):
+    """Estado de una entidad."""
+    LIVE = 0
+    DEAD = 1
+    REMOVE = 2
+
+
+class Kind(IntEnum):
+    """Tipo de entidad (mismos valores que las capas `etype` de array_world)."""
+    EMPTY = 0
+    PLANT_LOW = 1
+    PLANT_HIGH = 2
+    ANIMAL_SMALL = 3
+    ANIMAL_BIG = 4
+    FUNGI = 5
+
+
+LIVE, DEAD, REMOVE = State.LIVE, State.DEAD, State.REMOVE
+
+# Atributos que el registro de entidades (registry.EntityStore) guarda en cada entidad
+REGISTRY_SLOTS = ('id', 'dense_index', 'type_index')
+
+
+def clone(entity):
+    """Copia superficial de una entidad con __slots__ (sin los datos del registro)."""
+    cls = entity.__class__
+    other = cls.__new__(cls)
+    for klass in cls.__mro__:
+        for name in getattr(klass, '__slots__', ()):
+            if name not in REGISTRY_SLOTS and hasattr(entity, name):
+                setattr(other, name, getattr(entity, name))
+    return other
@@ -0,0 +1,141 @@
+#event_world.py
+from world import World
+from animal import AnimalSmall, AnimalBig
+from plant import PlantLow, PlantHigh
+from fungi import Fungi
+from entity import LIVE, DEAD
+from scheduler import TimingWheel
+
+PLANT_REPRODUCTION = 8  # Las plantas intentan reproducirse cada 8 ticks de vida
+FUNGI_PERIOD = 2  # Los hongos actúan cada 2 ticks
+
+
+class EventWorld(World):
+    """Motor por eventos: mismas reglas que World, pero cada tick sólo procesa las entidades con algo que hacer.
+
+    La vida máxima se sortea una vez al nacer y los hitos (reproducción, promoción,
+    muerte, acción de los hongos) se programan en una rueda de temporización; la aparición
+    de hongos en cadáveres ya está programada en World. En cada tick se procesan los eventos
+    vencidos y los animales vivos, que se mueven en todos los ticks; el coste depende de la
+    actividad, no de la población.
+
+    Las plantas y los hongos sólo actualizan `ticks_alive` al despertar; los checkpoints
+    guardan la rueda de eventos y las vidas sorteadas junto al estado de World.
+    """
+
+    def __init__(self, width=24, height=24, seed=None, generate=True, terrain="minimal"):
+        super().__init__(width, height, seed=seed, generate=generate, terrain=terrain)
+        # Eventos (id, edad): la edad que tendrá la entidad al despertar
+        self.wheel = TimingWheel()
+        self.lifespans = {}  # id -> edad de muerte sorteada al nacer
+        self.movers = {}  # id -> animal vivo, en orden de nacimiento
+        self.birth_tick = 0  # Tick en que una entidad añadida ahora cumple su primer tick de vida
+        self.phases = [("movement", self._move_animals), ("events", self._run_events),
+                       ("animals", self._update_animals), ("soil_cycle", self._apply_soil_cycle),
+                       ("spawn_fungi", self._spawn_fungi)]
+
+    def save_checkpoint(self, path):
+        from checkpoint import save_event_world
+        save_event_world(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        from checkpoint import load_event_world
+        return load_event_world(path)
+
+    def fork(self, seed=None):
+        other = super().fork(seed)
+        other.wheel = self.wheel.copy()
+        other.lifespans = dict(self.lifespans)
+        other.movers = {entity_id: other.entities.get(entity_id) for entity_id in self.movers}
+        other.birth_tick = self.birth_tick
+        return other
+
+    def add_entity(self, entity):
+        super().add_entity(entity)
+        if entity in self.entities:
+            self._schedule_new(entity)
+
+    def spawn(self, entity):
+        super().spawn(entity)
+        self._schedule_new(entity)
+
+    def remove_entity(self, entity):
+        # Los eventos pendientes de la entidad se descartan al vencer: su id ya no existe
+        self.movers.pop(entity.id, None)
+        self.lifespans.pop(entity.id, None)
+        super().remove_entity(entity)
+
+    def refresh(self, entity):
+        super().refresh(entity)
+        if entity.state != LIVE:  # Muerta o removida: deja de programarse como viva
+            self.movers.pop(entity.id, None)
+            self.lifespans.pop(entity.id, None)
+
+    def _animals(self):
+        return list(self.movers.values())
+
+    def _schedule_new(self, entity):
+        """Sortea la vida máxima de una entidad nueva y programa su primer evento (los cadáveres los programa World)."""
+        if entity.state != LIVE:
+            return
+        if isinstance(entity, (AnimalSmall, AnimalBig)):
+            self.lifespans[entity.id] = entity.lifespan(self)
+            self.movers[entity.id] = entity
+        elif isinstance(entity, (PlantLow, PlantHigh)):
+            self.lifespans[entity.id] = entity.lifespan(self)
+            self._schedule_plant(entity)
+        else:
+            self._schedule_at_age(entity, entity.ticks_alive + FUNGI_PERIOD)
+
+    def _schedule_at_age(self, entity, age):
+        """Programa el próximo despertar de una entidad cuando tenga `age` ticks de vida."""
+        self.wheel.schedule(self.birth_tick + age - entity.ticks_alive - 1, (entity.id, age))
+
+    def _schedule_plant(self, entity):
+        """Próximo hito de una planta: reproducción, promoción a PlantHigh o muerte."""
+        age = entity.ticks_alive
+        due = min((age // PLANT_REPRODUCTION + 1) * PLANT_REPRODUCTION, self.lifespans[entity.id])
+        if isinstance(entity, PlantLow):
+            promotion = entity.promotion_age(self)
+            if promotion > age:
+                due = min(due, promotion)
+        self._schedule_at_age(entity, due)
+
+    def begin_tick(self):
+        super().begin_tick()
+        self.birth_tick = self.tick + 1  # Lo que nazca durante este tick empieza a vivir en el siguiente
+
+    def _run_events(self):
+        """Despierta a las entidades cuyos eventos vencen en este tick."""
+        due = self.wheel.advance()
+        if self.metrics is not None:
+            self.metrics.count("events", len(due))
+        for entity_id, age in due:
+            entity = self.entities.get(entity_id)
+            if entity is None or entity.state != LIVE:
+                continue  # Eliminada o muerta antes de su evento
+
+            entity.ticks_alive = age - 1  # El tick de la entidad lo incrementa
+            entity.grow(self)
+            if isinstance(entity, Fungi):
+                entity.check_death(self)
+            elif age >= self.lifespans[entity.id]:
+                entity.state = DEAD
+            self.refresh(entity)
+            if entity.state == LIVE:
+                if isinstance(entity, Fungi):
+                    self._schedule_at_age(entity, age + FUNGI_PERIOD)
+                else:
+                    self._schedule_plant(entity)
+
+    def _update_animals(self):
+        """Tick de los animales vivos tras moverse: consumo, muerte y reproducción."""
+        for entity in list(self.movers.values()):
+            if entity.id not in self.movers:
+                continue  # Eliminado durante este tick
+            entity.act(self)
+            entity.check_reproduction(self)  # Como en World: también el que muere en este tick
+            if entity.state == LIVE and entity.ticks_alive >= self.lifespans[entity.id]:
+                entity.state = DEAD
+            self.refresh(entity)
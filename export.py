@@ -0,0 +1,50 @@
+#export.py
+import argparse
+import csv
+import time
+from recorder import RecordingReader
+from world import CELL_LABELS
+
+
+def to_xlsx(recording_path, output_path):
+    """Convierte una grabación a un archivo Excel con una hoja por tick."""
+    from openpyxl import Workbook  # Para generar el archivo Excel
+
+    reader = RecordingReader(recording_path)
+    workbook = Workbook(write_only=True)  # Escribe fila a fila sin guardar celdas en memoria
+    for tick, codes in reader.frames():
+        sheet = workbook.create_sheet(title=f"Tick {tick}")
+        for y in range(reader.height):
+            row = codes[y * reader.width:(y + 1) * reader.width]
+            sheet.append([CELL_LABELS[code] for code in row])
+    workbook.save(output_path)
+
+
+def to_csv(recording_path, output_path):
+    """Convierte una grabación a CSV: una fila por tick y fila de la cuadrícula."""
+    reader = RecordingReader(recording_path)
+    with open(output_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["tick", "y"] + [f"x{x}" for x in range(reader.width)])
+        for tick, codes in reader.frames():
+            for y in range(reader.height):
+                row = codes[y * reader.width:(y + 1) * reader.width]
+                writer.writerow([tick, y] + [CELL_LABELS[code] for code in row])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convierte una grabación .vida a xlsx o CSV.")
+    parser.add_argument("recording", help="archivo de grabación (.vida)")
+    parser.add_argument("output", help="archivo de salida (.xlsx o .csv)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.output.endswith(".xlsx"):
+        to_xlsx(args.recording, args.output)
+    else:
+        to_csv(args.recording, args.output)
+    print(f"Resumen de la simulación guardado en '{args.output}' ({time.perf_counter() - start:.2f} s).")
+
+
+if __name__ == "__main__":
+    main()
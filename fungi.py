@@ -1,46 +1,33 @@
 #fungi.py
-import random
+from rng import FUNGI
+from entity import Kind, LIVE, DEAD, REGISTRY_SLOTS
 
 class Fungi:
-    def __init__(self, x, y):
+    __slots__ = ('x', 'y', 'hp', 'state', 'ticks_alive', 'corpse') + REGISTRY_SLOTS
+    kind = Kind.FUNGI
+    family = 'fungi'  # Clases con la misma familia comparten memoria y pool
+
+    def __init__(self, x, y, corpse=Kind.EMPTY):
         self.x = x
         self.y = y
         self.hp = 3  # Un hongo comienza con 3 de vida
-        self.state = 'live'
+        self.state = LIVE
         self.ticks_alive = 0  # Contador de ticks de vida
+        self.corpse = corpse  # Tipo del cadáver que tiene debajo (Kind.EMPTY si no hay)
 
-    def grow(self, grid):
-        """Crece si hay entidades muertas cerca y las elimina con probabilidad."""
-        if self.state == 'dead':
+    def grow(self, world):
+        """Cada 2 ticks, si tiene un cadáver debajo, gana 1 hp y tiene 20% de eliminarlo."""
+        if self.state == DEAD:
             return
 
         self.ticks_alive += 1  # Incrementar ticks de vida
 
-        found_dead = False
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx = self.x + dx
-                ny = self.y + dy
-                if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]):
-                    cell = grid[ny][nx]
-                    # Verificar si la celda contiene una entidad muerta
-                    if hasattr(cell, 'state') and cell.state == 'dead':
-                        self.hp += 1  # Absorbe nutrientes
-                        found_dead = True
-
-        # Si hay cadáveres, chance del 20% de eliminarlos
-        if found_dead and random.random() < 0.2:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx = self.x + dx
-                    ny = self.y + dy
-                    if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]):
-                        cell = grid[ny][nx]
-                        if hasattr(cell, 'state') and cell.state == 'dead':
-                            grid[ny][nx] = None  # Eliminar cadáver
-                            break  # Solo elimina un cadáver por tick
+        if self.corpse != Kind.EMPTY and self.ticks_alive % 2 == 0:
+            self.hp += 1  # Absorbe nutrientes del cadáver
+            if world.rng.random(FUNGI, self.id) < 0.2:
+                world.clear_corpse(self)  # Ciclo de tierra: la celda se enriquece
 
-    def check_death(self):
-        """El hongo muere si su HP llega a 0 o negativo."""
+    def check_death(self, world):
+        """El hongo es removido si su HP llega a 0 o negativo."""
         if self.hp <= 0:
-            self.state = 'dead'
\ No newline at end of file
+            world.remove_fungus(self)
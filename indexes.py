@@ -0,0 +1,118 @@
+#indexes.py
+from array import array
+from entity import LIVE
+
+# Tipos indexados: cada entidad viva por su clase y todas las muertas juntas
+KINDS = ("PlantLow", "PlantHigh", "AnimalSmall", "AnimalBig", "Fungi", "dead")
+COUNTED = KINDS[:-1]  # Tipos con recuento de vecinos: los que buscan los animales (comida y pareja)
+
+
+def kind_of(cell):
+    """Devuelve el tipo indexado de una celda, o None si no contiene una entidad."""
+    if cell is None:
+        return None
+    if cell.state != LIVE:
+        return "dead"
+    return cell.__class__.__name__
+
+
+class GridIndex:
+    """Índices de la cuadrícula que se actualizan en cada cambio de celda.
+
+    - cell_kind: tipo indexado de cada celda.
+    - counts[tipo]: cuántas entidades vivas del tipo hay en el vecindario 3x3 de cada celda (incluida ella).
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.cell_kind = [None] * size  # Tipo indexado actualmente en cada celda
+        self.counts = {kind: array('H', bytes(2 * size)) for kind in COUNTED}
+
+    def copy(self):
+        """Copia independiente de los índices."""
+        other = GridIndex.__new__(GridIndex)
+        other.width, other.height = self.width, self.height
+        other.cell_kind = self.cell_kind[:]
+        other.counts = {kind: array('H', c) for kind, c in self.counts.items()}
+        return other
+
+    def set(self, x, y, kind):
+        """Registra que la celda (x, y) contiene ahora una entidad de `kind` (o nada si es None).
+
+        Devuelve True si el tipo indexado de la celda cambió.
+        """
+        i = y * self.width + x
+        old = self.cell_kind[i]
+        if old == kind:
+            return False
+        if old in self.counts:
+            self._update(x, y, old, -1)
+        if kind in self.counts:
+            self._update(x, y, kind, 1)
+        self.cell_kind[i] = kind
+        return True
+
+    def _update(self, x, y, kind, delta):
+        counts = self.counts[kind]
+        width = self.width
+        for ny in range(max(0, y - 1), min(self.height, y + 2)):
+            row = ny * width
+            for nx in range(max(0, x - 1), min(width, x + 2)):
+                counts[row + nx] += delta
+
+    def count(self, kind, x, y):
+        """Número de entidades de `kind` en el vecindario 3x3 de (x, y)."""
+        return self.counts[kind][y * self.width + x]
+
+
+class CellSet:
+    """Conjunto disperso de celdas: alta, baja, pertenencia y sorteo uniforme en O(1).
+
+    `cells` guarda los miembros sin huecos y `position[i]` el lugar de la celda i en
+    `cells` (-1 si no está). Al borrar, el último miembro ocupa el hueco.
+    """
+
+    def __init__(self, size, full=False):
+        self.cells = array('I', range(size)) if full else array('I')
+        self.position = array('i', range(size)) if full else array('i', [-1]) * size
+
+    def copy(self):
+        other = CellSet.__new__(CellSet)
+        other.cells = array('I', self.cells)
+        other.position = array('i', self.position)
+        return other
+
+    def reset(self, cells):
+        """Sustituye los miembros por `cells`, en ese orden."""
+        self.cells = array('I', cells)
+        self.position = array('i', [-1]) * len(self.position)
+        for p, i in enumerate(self.cells):
+            self.position[i] = p
+
+    def add(self, i):
+        if self.position[i] < 0:
+            self.position[i] = len(self.cells)
+            self.cells.append(i)
+
+    def discard(self, i):
+        p = self.position[i]
+        if p >= 0:
+            last = self.cells.pop()
+            if last != i:
+                self.cells[p] = last
+                self.position[last] = p
+            self.position[i] = -1
+
+    def __contains__(self, i):
+        return self.position[i] >= 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def sample(self, rng, stream, key, draw=0):
+        """Celda uniforme del conjunto, o None si está vacío."""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(stream, key, len(self.cells), draw)]
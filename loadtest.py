@@ -0,0 +1,109 @@
+#loadtest.py
+import argparse
+import asyncio
+import struct
+import time
+from urllib.parse import urlencode
+from websocket import client_handshake, read_frame, encode_frame, BINARY, CLOSE
+from server import decode_frame, KEYFRAME
+from ensemble import ENGINES
+
+
+class LoadStats:
+    """Frames, latencias y resincronizaciones de todos los clientes."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.latencies = []
+        self.resyncs = 0  # Keyframes recibidos tras el primero: el servidor descartó frames
+        self.connected = 0
+        self.errors = 0
+
+
+async def subscriber(host, port, path, duration, stats):
+    """Un cliente suscrito a una sesión durante `duration` segundos."""
+    loop = asyncio.get_running_loop()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        await client_handshake(reader, writer, f"{host}:{port}", path)
+    except (OSError, ValueError, asyncio.IncompleteReadError):
+        stats.errors += 1
+        return
+    stats.connected += 1
+
+    end = loop.time() + duration
+    keyframes = 0
+    try:
+        while loop.time() < end:
+            try:
+                opcode, payload = await asyncio.wait_for(read_frame(reader, max_size=None), end - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if opcode == CLOSE:
+                stats.errors += 1
+                break
+            if opcode != BINARY:
+                continue
+            kind, tick, sent = decode_frame(payload)[:3]
+            stats.frames += 1
+            stats.bytes += len(payload)
+            stats.latencies.append(time.time() - sent)
+            if kind == KEYFRAME:
+                keyframes += 1
+        stats.resyncs += max(0, keyframes - 1)
+        writer.write(encode_frame(CLOSE, struct.pack(">H", 1000), mask=True))
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        stats.errors += 1
+    finally:
+        writer.close()
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+async def run(args):
+    stats = LoadStats()
+    query = urlencode({"engine": args.engine, "width": args.width, "height": args.height, "plants": args.plants,
+                       "animals": args.animals, "fungi": args.fungi, "tps": args.tps})
+    tasks = []
+    for s in range(args.sessions):
+        path = f"/session/{args.prefix}{s}?{query}&seed={s}"
+        for _ in range(args.clients):
+            tasks.append(subscriber(args.host, args.port, path, args.duration, stats))
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor WebSocket (server.py).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=200, help="sesiones simultáneas")
+    parser.add_argument("--clients", type=int, default=1, help="suscriptores por sesión")
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos de medición")
+    parser.add_argument("--prefix", default="carga", help="prefijo de los nombres de sesión")
+    parser.add_argument("--engine", choices=ENGINES, default="world")
+    parser.add_argument("--width", type=int, default=24)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--plants", type=int, default=5)
+    parser.add_argument("--animals", type=int, default=10)
+    parser.add_argument("--fungi", type=int, default=2)
+    parser.add_argument("--tps", type=float, default=10.0, help="ticks por segundo de cada sesión")
+    args = parser.parse_args(argv)
+
+    stats, elapsed = asyncio.run(run(args))
+    latencies = sorted(stats.latencies)
+    print(f"{stats.connected} clientes conectados ({stats.errors} errores) en {args.sessions} sesiones")
+    print(f"frames: {stats.frames} ({stats.frames / elapsed:.1f}/s en total, "
+          f"{stats.frames / elapsed / max(1, stats.connected):.2f}/s por cliente), {stats.bytes / elapsed / 1024:.1f} KiB/s")
+    print(f"latencia ms: p50={1000 * percentile(latencies, 0.5):.2f} p95={1000 * percentile(latencies, 0.95):.2f} "
+          f"p99={1000 * percentile(latencies, 0.99):.2f} máx={1000 * (latencies[-1] if latencies else float('nan')):.2f}")
+    print(f"resincronizaciones por frames descartados: {stats.resyncs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#metrics.py
+import json
+import os
+
+
+class Metrics:
+    """Temporizadores y contadores de la simulación, por tick (apagados salvo que se conecten a un mundo).
+
+    Mide el tiempo de cada fase del tick, de cada tipo de entidad (World) y de cada
+    observador (render, grabación...), y cuenta entidades procesadas, celdas recorridas,
+    nacimientos y muertes. Con `path` exporta cada tick como una línea JSON
+    (`fmt="jsonl"`) o reescribe un archivo de texto de Prometheus (`fmt="prometheus"`).
+    """
+
+    def __init__(self, path=None, fmt="jsonl"):
+        if fmt not in ("jsonl", "prometheus"):
+            raise ValueError(f"Formato de métricas desconocido: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.file = open(path, "w") if path and fmt == "jsonl" else None
+        self.ticks = 0
+        # Valores del tick en curso (el motor escribe en phases directamente, ver Engine.update)
+        self.phases = {}  # fase u observador -> segundos
+        self.types = {}  # tipo de entidad -> segundos
+        self.entities = {}  # tipo de entidad -> entidades procesadas
+        self.counters = {}  # celdas recorridas, nacimientos, muertes...
+        # Acumulados de toda la ejecución
+        self.totals = {"phases": {}, "types": {}, "entities": {}, "counters": {}}
+
+    def attach(self, world):
+        """Activa la instrumentación en `world`."""
+        world.metrics = self
+        world.phase_times = self.phases
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def end_tick(self, world):
+        """Acumula y exporta el tick recién terminado y reinicia los valores por tick."""
+        self.ticks += 1
+        current = {"phases": self.phases, "types": self.types, "entities": self.entities, "counters": self.counters}
+        for group, values in current.items():
+            total = self.totals[group]
+            for name, value in values.items():
+                total[name] = total.get(name, 0) + value
+
+        if self.file is not None:
+            self.file.write(json.dumps({"tick": world.tick, **current}) + "\n")
+        elif self.path:
+            self.write_prometheus(world)
+
+        # Se vacían en el sitio: el mundo mantiene una referencia a `phases`
+        for values in current.values():
+            values.clear()
+
+    def write_prometheus(self, world):
+        """Reescribe el archivo de texto (formato textfile de Prometheus) con los acumulados."""
+        lines = [f"vida_ticks_total {self.ticks}", f"vida_tick {world.tick}"]
+        families = [("phases", "vida_phase_seconds_total", "phase"), ("types", "vida_entity_seconds_total", "kind"),
+                    ("entities", "vida_entities_processed_total", "kind"), ("counters", "vida_events_total", "event")]
+        for group, metric, label in families:
+            lines.append(f"# TYPE {metric} counter")
+            for name, value in sorted(self.totals[group].items()):
+                lines.append(f'{metric}{{{label}="{name}"}} {value}')
+        # Escribir aparte y renombrar: el recolector nunca lee un archivo a medias
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+    def summary(self):
+        """Tabla de texto con los tiempos y contadores acumulados."""
+        ticks = max(1, self.ticks)
+        phases = self.totals["phases"]
+        total = sum(phases.values()) or 1.0
+        lines = [f"Métricas de {self.ticks} ticks", f"{'fase / tipo':28s} {'total s':>10s} {'ms/tick':>10s} {'%':>6s}"]
+        for name, seconds in sorted(phases.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:28s} {seconds:10.3f} {1000 * seconds / ticks:10.3f} {100 * seconds / total:6.1f}")
+        for name, seconds in sorted(self.totals["types"].items(), key=lambda item: -item[1]):
+            processed = self.totals["entities"].get(name, 0)
+            lines.append(f"  {name:26s} {seconds:10.3f} {1000 * seconds / ticks:10.3f} {100 * seconds / total:6.1f}"
+                         f"  ({processed} procesadas)")
+        for name, value in sorted(self.totals["counters"].items()):
+            lines.append(f"{name:28s} {value:10d} {value / ticks:10.1f}/tick")
+        return "\n".join(lines)
+
+    def close(self):
+        """Cierra el archivo de exportación e imprime el resumen."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        print(self.summary())
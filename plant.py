@@ -1,90 +1,93 @@
 #plant.py
-import random
+from rng import DEATH, REPRODUCE
+from terrain import SOIL_PLUS
+from entity import Kind, LIVE, DEAD, REGISTRY_SLOTS
 
 class Plant:
-    def __init__(self, x, y, energy=5, plant_type='low'):
+    __slots__ = ('x', 'y', 'energy', 'state', 'ticks_alive') + REGISTRY_SLOTS
+    family = 'plant'  # Clases con la misma familia comparten memoria y pool
+
+    def __init__(self, x, y, energy=5):
         self.x = x
         self.y = y
         self.energy = int(energy)  # ✅ Asegurar que siempre sea un número
-        self.plant_type = plant_type  # 'low' o 'high'
-        self.state = 'live'
+        self.state = LIVE
         self.ticks_alive = 0  # Contador de ticks de vida
 
     def photosynthesize(self):
         """Gana energía a través de la fotosíntesis."""
         self.energy += 2  # Aumenta la energía con cada tick
 
-    def update(self, grid):
+    def update(self, world):
         """Ejecuta sus acciones cada tick."""
         self.photosynthesize()
-        self.grow(grid)
+        self.grow(world)
 
         # Si la energía llega a 0, la planta muere
         if self.energy <= 0:
-            self.state = 'dead'
+            self.state = DEAD
+
+    def lifespan(self, world):
+        """Vida máxima: 30 ticks (+/-3 de variación), sorteada en el tick actual."""
+        return 30 + world.rng.randint(DEATH, self.id, -3, 3)
+
+    def check_death(self, world):
+        """La planta muere después de 30 ticks (+/-3 de variación) o sin energía."""
+        if self.ticks_alive >= self.lifespan(world) or self.energy <= 0:
+            self.state = DEAD
+
+    def reproduce(self, world):
+        """Cada 8 ticks, 30% de generar una PlantLow (5 de energía) en una celda libre a su lado."""
+        if self.ticks_alive % 8 == 0 and world.rng.random(REPRODUCE, self.id) < 0.3:
+            if world.metrics is not None:
+                world.metrics.count("cells_scanned", 4)
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            valid_positions = []
+            for dx, dy in directions:
+                nx = self.x + dx
+                ny = self.y + dy
+                if 0 <= nx < world.width and 0 <= ny < world.height and ny * world.width + nx in world.empty_cells:
+                    valid_positions.append((nx, ny))
 
-    def check_death(self):
-        """La planta muere después de 30 ticks (+/-3 de variación)."""
-        if self.ticks_alive >= 30 + random.randint(-3, 3):
-            self.state = 'dead'
+            if valid_positions:
+                new_x, new_y = world.rng.choice(REPRODUCE, self.id, valid_positions, draw=1)
+                world.spawn(world.create(PlantLow, new_x, new_y, energy=5))
 
 class PlantLow(Plant):
+    __slots__ = ()
+    kind = Kind.PLANT_LOW
+
     def __init__(self, x, y, energy=5):
-        super().__init__(x, y, plant_type='low', energy=energy)
+        super().__init__(x, y, energy=energy)
 
-    def grow(self, grid):
+    def promotion_age(self, world):
+        """Edad a la que se convierte en PlantHigh: 24 ticks, o 16 sobre soil+."""
+        return 16 if world.terrain[self.y * world.width + self.x] == SOIL_PLUS else 24
+
+    def grow(self, world):
         """Crecimiento y reproducción de la planta."""
-        if self.state == 'dead':
+        if self.state == DEAD:
             return
 
         self.ticks_alive += 1  # Incrementar ticks de vida
 
-        # Transformarse en PlantHigh después de 16-24 ticks
-        if self.ticks_alive >= 16 and random.random() < 0.5:
-            grid[self.y][self.x] = PlantHigh(self.x, self.y, energy=self.energy)
-            return
-
-        # Reproducción de la planta baja con 30% de probabilidad cada 8 ticks
-        if self.ticks_alive % 8 == 0 and random.random() < 0.3:
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            valid_positions = []
-            for dx, dy in directions:
-                nx = self.x + dx
-                ny = self.y + dy
-                if 0 <= nx < len(grid[0]) and 0 <= ny < len(grid) and grid[ny][nx] is None:
-                    valid_positions.append((nx, ny))
+        # Transformarse en PlantHigh (en el mismo objeto: conserva edad y energía) y reproducirse ya como tal
+        if self.ticks_alive >= self.promotion_age(world):
+            world.transform(self, PlantHigh)
 
-            if valid_positions:
-                new_x, new_y = random.choice(valid_positions)
-                grid[new_y][new_x] = PlantLow(new_x, new_y, energy=5)
+        self.reproduce(world)
 
 class PlantHigh(Plant):
+    __slots__ = ()
+    kind = Kind.PLANT_HIGH
+
     def __init__(self, x, y, energy=10):
-        super().__init__(x, y, plant_type='high', energy=energy)
+        super().__init__(x, y, energy=energy)
 
-    def grow(self, grid):
+    def grow(self, world):
         """Crecimiento y reproducción de la planta."""
-        if self.state == 'dead':
+        if self.state == DEAD:
             return
 
         self.ticks_alive += 1  # Incrementar ticks de vida
-
-        # Reproducción de la planta alta con 30% de probabilidad cada 8 ticks
-        if self.ticks_alive % 8 == 0 and random.random() < 0.3:
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            valid_positions = []
-            for dx, dy in directions:
-                nx = self.x + dx
-                ny = self.y + dy
-                if 0 <= nx < len(grid[0]) and 0 <= ny < len(grid) and grid[ny][nx] is None:
-                    valid_positions.append((nx, ny))
-
-            if valid_positions:
-                new_x, new_y = random.choice(valid_positions)
-                grid[new_y][new_x] = PlantLow(new_x, new_y, energy=3)  # Usamos PlantLow directamente
-                self.energy -= 1  # Usa energía al reproducirse
-
-    def check_death(self):
-        """La planta muere después de 30 ticks (+/-3 de variación)."""
-        if self.ticks_alive >= 30 + random.randint(-3, 3):
-            self.state = 'dead'
\ No newline at end of file
+        self.reproduce(world)
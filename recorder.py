@@ -0,0 +1,240 @@
+#recorder.py
+import mmap
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+try:
+    import zstandard  # Opcional: mejor compresión si está instalado
+except ImportError:
+    zstandard = None
+
+# Formato de grabación (.vida):
+#   cabecera: MAGIC, versión, ancho, alto, intervalo de keyframes, compresión
+#   frames:   tick, tipo (KEYFRAME/DELTA), longitud, datos comprimidos
+# Un keyframe guarda los códigos de todas las celdas (ver world.CELL_LABELS) seguidos del
+# terreno de todas las celdas (también el que tapan las entidades);
+# un delta guarda el XOR con el frame anterior (casi todo ceros, comprime muy bien).
+#   índice (al cerrar): tick de cada frame (uint32), posición de cada frame (uint64)
+#   y TRAILER con la posición del índice, el número de frames e INDEX_MAGIC.
+# Si la grabación se interrumpió antes de cerrarla, el lector reconstruye el índice leyendo las cabeceras de frame.
+MAGIC = b"VIDA"
+VERSION = 1
+HEADER = struct.Struct("<4sBIIHB")
+MAX_KEYFRAME_INTERVAL = 0xFFFF  # El intervalo de keyframes se guarda en la cabecera como uint16
+FRAME = struct.Struct("<IBI")
+INDEX_MAGIC = b"VIDX"
+TRAILER = struct.Struct("<QI4s")
+KEYFRAME = 0
+DELTA = 1
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def _xor(a, b):
+    """XOR byte a byte de dos buffers del mismo tamaño."""
+    n = len(a)
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+def _compressor(compression):
+    if compression == COMPRESSIONS["none"]:
+        return bytes
+    if compression == COMPRESSIONS["zlib"]:
+        return lambda data: zlib.compress(data, 6)
+    if zstandard is None:
+        raise ValueError("La compresión zstd requiere el paquete 'zstandard'.")
+    return zstandard.ZstdCompressor(level=3).compress
+
+
+def _decompressor(compression):
+    if compression == COMPRESSIONS["none"]:
+        return bytes
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.decompress
+    if zstandard is None:
+        raise ValueError("La grabación usa zstd y el paquete 'zstandard' no está instalado.")
+    return zstandard.ZstdDecompressor().decompress
+
+
+class Recorder:
+    """Observador que escribe cada tick en disco como un frame de códigos enteros."""
+
+    def __init__(self, path, keyframe_interval=64, compression="zlib"):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compresión desconocida: {compression}")
+        if not 1 <= keyframe_interval <= MAX_KEYFRAME_INTERVAL:
+            raise ValueError(f"El intervalo de keyframes debe estar entre 1 y {MAX_KEYFRAME_INTERVAL}")
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.compression = COMPRESSIONS[compression]
+        self.compress = _compressor(self.compression)
+        self.file = None
+        self.previous = None  # Último frame escrito (única copia en memoria)
+        self.frames = 0
+        self.ticks = array("I")  # Índice: tick y posición de cada frame
+        self.offsets = array("Q")
+
+    def on_tick(self, world):
+        """Escribe el estado actual como keyframe o delta."""
+        if self.file is None:
+            self.file = open(self.path, "wb")
+            self.file.write(HEADER.pack(MAGIC, VERSION, world.width, world.height,
+                                        self.keyframe_interval, self.compression))
+
+        codes = bytes(world.get_grid_codes()) + bytes(world.terrain)
+        if self.previous is None or self.frames % self.keyframe_interval == 0:
+            kind, payload = KEYFRAME, codes
+        else:
+            kind, payload = DELTA, _xor(codes, self.previous)
+
+        data = self.compress(payload)
+        self.ticks.append(world.tick)
+        self.offsets.append(self.file.tell())
+        self.file.write(FRAME.pack(world.tick, kind, len(data)))
+        self.file.write(data)
+        self.previous = codes
+        self.frames += 1
+        return True
+
+    def close(self):
+        """Escribe el índice de frames y cierra el archivo de grabación."""
+        if self.file is not None:
+            position = self.file.tell()
+            self.file.write(self.ticks.tobytes())
+            self.file.write(self.offsets.tobytes())
+            self.file.write(TRAILER.pack(position, self.frames, INDEX_MAGIC))
+            self.file.close()
+            self.file = None
+
+
+class RecordingReader:
+    """Lee una grabación .vida proyectada en memoria, en orden o saltando a cualquier tick.
+
+    Un salto descomprime como mucho un keyframe y los deltas hasta el siguiente, así que
+    cuesta lo mismo en cualquier punto de la grabación. De los últimos `cached_segments` tramos
+    entre keyframes se guardan sólo el keyframe y el último frame descodificado (memoria acotada
+    aunque la cuadrícula sea grande): avanzar continúa desde ese frame y retroceder, desde el keyframe.
+    """
+
+    def __init__(self, path, cached_segments=4):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            raise ValueError(f"{path} no es una grabación de la simulación.")
+        magic, version, self.width, self.height, self.keyframe_interval, self.compression = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es una grabación de la simulación.")
+        if version != VERSION:
+            raise ValueError(f"Versión de grabación no soportada: {version}")
+        self.decompress = _decompressor(self.compression)
+        self.cells = self.width * self.height
+        self.ticks, self.offsets, self.end = self._read_index()
+        self.cached_segments = cached_segments
+        self.segments = OrderedDict()  # Posición del keyframe -> [keyframe, posición del último frame, último frame]
+
+    def _read_index(self):
+        """Tick y posición de cada frame, y fin de los frames en el archivo."""
+        data = self.data
+        if len(data) >= HEADER.size + TRAILER.size:
+            position, count, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+            if magic == INDEX_MAGIC and position + 12 * count + TRAILER.size == len(data):
+                ticks, offsets = array("I"), array("Q")
+                ticks.frombytes(data[position:position + 4 * count])
+                offsets.frombytes(data[position + 4 * count:position + 12 * count])
+                return ticks, offsets, position
+
+        # Grabación interrumpida, sin índice: recorrer las cabeceras de frame (sin descomprimir nada)
+        ticks, offsets = array("I"), array("Q")
+        offset = HEADER.size
+        while offset + FRAME.size <= len(data):
+            tick, kind, length = FRAME.unpack_from(data, offset)
+            if offset + FRAME.size + length > len(data):
+                break  # Último frame a medio escribir
+            ticks.append(tick)
+            offsets.append(offset)
+            offset += FRAME.size + length
+        return ticks, offsets, offset
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def close(self):
+        self.segments.clear()
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, position):
+        """(tipo, datos descomprimidos) del frame en la posición `position` del índice."""
+        offset = self.offsets[position]
+        _, kind, length = FRAME.unpack_from(self.data, offset)
+        start = offset + FRAME.size
+        return kind, self.decompress(self.data[start:start + length])
+
+    def position(self, tick):
+        """Posición en el índice del frame de `tick` (o del primero posterior)."""
+        ticks = self.ticks
+        position = tick - ticks[0] if ticks else 0
+        if 0 <= position < len(ticks) and ticks[position] == tick:
+            return position  # Ticks consecutivos: acceso directo
+        return bisect_left(ticks, tick)
+
+    def _decode(self, position):
+        """Datos descodificados (códigos y terreno) del frame en la posición `position`."""
+        if not 0 <= position < len(self.ticks):
+            raise IndexError(f"La grabación no tiene el frame {position}")
+        start = position
+        while start > 0 and self.data[self.offsets[start] + 4] != KEYFRAME:
+            start -= 1
+        segment = self.segments.get(start)
+        if segment is None:
+            keyframe = self._read(start)[1]
+            segment = self.segments[start] = [keyframe, start, keyframe]
+            if len(self.segments) > self.cached_segments:
+                self.segments.popitem(last=False)
+        else:
+            self.segments.move_to_end(start)
+        keyframe, current, payload = segment
+        if position < current:
+            current, payload = start, keyframe  # Hacia atrás: de nuevo desde el keyframe
+        # Aplicar los deltas desde el frame descodificado hasta el pedido
+        while current < position:
+            current += 1
+            payload = _xor(self._read(current)[1], payload)
+        segment[1:] = current, payload
+        return payload
+
+    def frame(self, position):
+        """Códigos de todas las celdas del frame en la posición `position` del índice."""
+        return self._decode(position)[:self.cells]
+
+    def terrain(self, position):
+        """Terreno de todas las celdas del frame en la posición `position`."""
+        return self._decode(position)[self.cells:]
+
+    def __contains__(self, tick):
+        position = self.position(tick)
+        return position < len(self.ticks) and self.ticks[position] == tick
+
+    def seek(self, tick):
+        """Códigos de todas las celdas en el tick `tick`."""
+        if tick not in self:
+            raise KeyError(f"La grabación no tiene el tick {tick}")
+        return self.frame(self.position(tick))
+
+    def frames(self):
+        """Genera (tick, códigos) para cada frame, reconstruyendo los deltas."""
+        previous = None
+        for position, tick in enumerate(self.ticks):
+            kind, payload = self._read(position)
+            if kind == DELTA:
+                payload = _xor(payload, previous)
+            previous = payload
+            yield tick, payload[:self.cells]
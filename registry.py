@@ -0,0 +1,136 @@
+#registry.py
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class EntityStore:
+    """Registro de entidades con ids de slot/generación y altas y bajas O(1).
+
+    El id de una entidad es `generación << 32 | slot`; al liberar un slot su generación
+    aumenta, así un id antiguo nunca apunta a la entidad que reutiliza el slot.
+    Las entidades se guardan en listas compactas (global y por tipo) y una baja
+    mueve la última entidad al hueco (swap-remove).
+    """
+
+    def __init__(self):
+        self.slots = []  # slot -> entidad (o None si está libre)
+        self.generations = []  # slot -> generación actual
+        self.free = []  # Slots libres para reutilizar
+        self.dense = []  # Todas las entidades, sin huecos
+        self.by_type = {}  # clase -> lista compacta de entidades de esa clase
+
+    def add(self, entity):
+        """Registra una entidad y le asigna un id."""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.slots)
+            self.slots.append(None)
+            self.generations.append(0)
+        self.slots[slot] = entity
+        entity.id = self.generations[slot] << SLOT_BITS | slot
+
+        entity.dense_index = len(self.dense)
+        self.dense.append(entity)
+        typed = self.by_type.setdefault(entity.__class__, [])
+        entity.type_index = len(typed)
+        typed.append(entity)
+
+    def restore(self, entity, entity_id):
+        """Vuelve a registrar una entidad con un id conocido (checkpoints y copias del mundo).
+
+        `slots`, `generations` y `free` deben haberse restaurado antes.
+        """
+        self.slots[entity_id & SLOT_MASK] = entity
+        entity.id = entity_id
+        entity.dense_index = len(self.dense)
+        self.dense.append(entity)
+        typed = self.by_type.setdefault(entity.__class__, [])
+        entity.type_index = len(typed)
+        typed.append(entity)
+
+    def remove(self, entity):
+        """Da de baja una entidad; devuelve False si no estaba registrada."""
+        if entity not in self:
+            return False
+        slot = entity.id & SLOT_MASK
+        self.slots[slot] = None
+        self.generations[slot] += 1
+        self.free.append(slot)
+
+        self._swap_remove(self.dense, entity, "dense_index")
+        self._swap_remove(self.by_type[entity.__class__], entity, "type_index")
+        entity.id = None
+        return True
+
+    @staticmethod
+    def _swap_remove(items, entity, attr):
+        """Quita `entity` de `items` moviendo la última entidad a su posición."""
+        i = getattr(entity, attr)
+        last = items.pop()
+        if last is not entity:
+            items[i] = last
+            setattr(last, attr, i)
+
+    def retype(self, entity, cls):
+        """Cambia la clase de una entidad registrada sin crear un objeto nuevo."""
+        self._swap_remove(self.by_type[entity.__class__], entity, "type_index")
+        entity.__class__ = cls
+        typed = self.by_type.setdefault(cls, [])
+        entity.type_index = len(typed)
+        typed.append(entity)
+
+    def get(self, entity_id):
+        """Devuelve la entidad con ese id, o None si ya no existe."""
+        slot = entity_id & SLOT_MASK
+        if slot < len(self.slots) and self.generations[slot] == entity_id >> SLOT_BITS:
+            return self.slots[slot]
+        return None
+
+    def of_type(self, cls):
+        """Lista compacta de las entidades de una clase (no modificar)."""
+        return self.by_type.get(cls, [])
+
+    def __contains__(self, entity):
+        entity_id = getattr(entity, "id", None)
+        return entity_id is not None and self.get(entity_id) is entity
+
+    def __len__(self):
+        return len(self.dense)
+
+    def __iter__(self):
+        # Copia: las altas y bajas durante un tick no alteran el recorrido
+        return iter(list(self.dense))
+
+
+class EntityPool:
+    """Listas libres de entidades dadas de baja para reutilizar su memoria.
+
+    Las clases de una misma `family` comparten `__slots__`, así que un objeto de la
+    lista libre puede reutilizarse como cualquier clase de su familia.
+    """
+
+    def __init__(self):
+        self.free = {}  # familia -> objetos disponibles
+        self.pending = []  # Bajas del tick actual (aún pueden estar referenciadas)
+
+    def create(self, cls, *args, **kwargs):
+        """Devuelve una entidad nueva de `cls`, reutilizando un objeto libre si lo hay."""
+        free = self.free.get(cls.family)
+        if not free:
+            return cls(*args, **kwargs)
+        entity = free.pop()
+        entity.__class__ = cls
+        entity.__init__(*args, **kwargs)
+        return entity
+
+    def release(self, entity):
+        """Marca una entidad dada de baja para reutilizarla a partir del próximo tick."""
+        self.pending.append(entity)
+
+    def flush(self):
+        """Pasa las bajas pendientes a las listas libres (llamar al final de cada tick)."""
+        for entity in self.pending:
+            self.free.setdefault(entity.family, []).append(entity)
+        self.pending.clear()
@@ -0,0 +1,188 @@
+#render.py
+import os
+import struct
+import time
+import zlib
+import pygame
+
+SCREEN_SIZE = (1024, 1024)  # Tamaño de la ventana
+FIRST_ENTITY_CODE = 5  # Códigos 0-4: terreno; 5 en adelante: entidades (ver world.CELL_LABELS)
+MAX_DIRTY_RECTS = 2000  # Con más celdas sucias es más barato actualizar la pantalla entera
+
+# Colores para recursos (rock, soil, soil+, water)
+COLORS = {
+    "ground": (34, 139, 34),  # Verde para el suelo
+    "water": (0, 0, 255),  # Azul para agua
+    "rock": (128, 128, 128),  # Gris para rocas
+    "soil": (139, 69, 19),  # Marrón para tierra
+    "soil+": (210, 105, 30),  # Marrón oscuro para tierra fértil
+}
+# Color de cada código de terreno
+TERRAIN_COLORS = [COLORS["ground"], COLORS["rock"], COLORS["soil"], COLORS["soil+"], COLORS["water"]]
+# Imagen de cada tipo de entidad viva, en el orden de sus códigos (5, 7, 9, 11, 13)
+SPRITE_FILES = ["plant1.png", "plant2.png", "animal1.png", "animal2.png", "fungi.png"]
+SKULL_FILE = "skull.png"  # Imagen para entidades muertas
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Atlas de sprites ya escalados (una fila: SPRITE_FILES y SKULL_FILE), en RGBA sin comprimir,
+# uno por tamaño de celda: cabecera ATLAS_MAGIC, clave de las imágenes de origen, tamaño de celda.
+# Cargarlo evita descodificar y escalar los PNG en cada arranque; la clave lo invalida si cambian.
+ATLAS_DIR = os.path.join(ASSET_DIR, ".sprite_cache")
+ATLAS_MAGIC = b"VATL"
+ATLAS_HEADER = struct.Struct("<4sII")
+
+
+def _atlas_key(files):
+    """Suma de comprobación de nombre, tamaño y fecha de las imágenes de origen."""
+    stats = [(name, os.stat(os.path.join(ASSET_DIR, name))) for name in files]
+    return zlib.crc32(repr([(name, st.st_size, st.st_mtime_ns) for name, st in stats]).encode())
+
+
+def _build_atlas(files, cell_size):
+    """Descodifica y escala las imágenes de origen en una superficie de una fila."""
+    atlas = pygame.Surface((cell_size * len(files), cell_size), pygame.SRCALPHA)
+    for n, name in enumerate(files):
+        image = pygame.image.load(os.path.join(ASSET_DIR, name))
+        atlas.blit(pygame.transform.scale(image, (cell_size, cell_size)), (n * cell_size, 0))
+    return atlas
+
+
+def load_atlas(cell_size, files=None):
+    """Superficie con las imágenes `files` escaladas a `cell_size`, leída de la caché en disco si está al día."""
+    files = files or SPRITE_FILES + [SKULL_FILE]
+    size = (cell_size * len(files), cell_size)
+    key = _atlas_key(files)
+    path = os.path.join(ATLAS_DIR, f"atlas_{cell_size}.rgba")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if ATLAS_HEADER.unpack_from(data) == (ATLAS_MAGIC, key, cell_size) and \
+                len(data) == ATLAS_HEADER.size + size[0] * size[1] * 4:
+            return pygame.image.frombytes(data[ATLAS_HEADER.size:], size, "RGBA")
+    except (OSError, struct.error):
+        pass  # Sin caché o ilegible: se regenera
+
+    atlas = _build_atlas(files, cell_size)
+    try:
+        os.makedirs(ATLAS_DIR, exist_ok=True)
+        # Escritura atómica: otros procesos pueden estar leyendo o generando el mismo atlas
+        partial = f"{path}.{os.getpid()}"
+        with open(partial, "wb") as f:
+            f.write(ATLAS_HEADER.pack(ATLAS_MAGIC, key, cell_size))
+            f.write(pygame.image.tobytes(atlas, "RGBA"))
+        os.replace(partial, path)
+    except OSError:
+        pass  # Directorio de sólo lectura: el atlas se usa sin guardarlo
+    return atlas
+
+
+def load_sprites(cell_size):
+    """Imágenes escaladas al tamaño de celda, indexadas por código de celda (None para terreno)."""
+    atlas = load_atlas(cell_size)
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()  # Mismo formato que la pantalla: blits más rápidos
+    tiles = [atlas.subsurface((n * cell_size, 0, cell_size, cell_size)) for n in range(len(SPRITE_FILES) + 1)]
+    sprites = [None] * FIRST_ENTITY_CODE
+    for sprite in tiles[:-1]:
+        sprites += [sprite, tiles[-1]]
+    return sprites
+
+
+def terrain_background(terrain, width, height, cell_size, size=None):
+    """Superficie de fondo con el color de terreno de cada celda (`terrain`: códigos fila a fila)."""
+    cells = pygame.image.frombytes(bytes(terrain), (width, height), "P")
+    cells.set_palette(TERRAIN_COLORS)
+    background = pygame.Surface(size or (width * cell_size, height * cell_size))
+    background.fill(COLORS["ground"])
+    background.blit(pygame.transform.scale(cells, (width * cell_size, height * cell_size)), (0, 0))
+    return background
+
+
+def paint_terrain(background, width, cell_size, cells, codes):
+    """Repinta en el fondo el terreno de las celdas indicadas (el terreno cambia con el ciclo de tierra)."""
+    for i, code in zip(cells, codes):
+        background.fill(TERRAIN_COLORS[code], ((i % width) * cell_size, (i // width) * cell_size, cell_size, cell_size))
+
+
+def draw_cells(surface, background, sprites, width, cell_size, cells, codes):
+    """Dibuja en `surface` las celdas indicadas con sus códigos; devuelve sus rectángulos.
+
+    Cada celda repone su terreno desde `background` y encima dibuja el sprite de su entidad.
+    """
+    rects = []
+    for i, code in zip(cells, codes):
+        rect = pygame.Rect((i % width) * cell_size, (i // width) * cell_size, cell_size, cell_size)
+        surface.blit(background, rect, rect)
+        sprite = sprites[code]
+        if sprite is not None:
+            surface.blit(sprite, rect)
+        rects.append(rect)
+    return rects
+
+
+class PygameRenderer:
+    """Observador que dibuja el mundo en una ventana de Pygame redibujando sólo las celdas que cambian.
+
+    El terreno (`world.terrain`) se pinta al empezar en una superficie de fondo y se repinta
+    en las celdas donde cambia; cada frame repone el fondo y el sprite de las celdas
+    modificadas desde el frame anterior. Los frames se limitan a `fps` (los ticks intermedios
+    se acumulan sin dibujar) y los ticks, opcionalmente, a `tps`.
+    """
+
+    def __init__(self, world, screen_size=SCREEN_SIZE, fps=30, tps=None):
+        pygame.init()
+        self.width = world.width
+        self.cell_size = max(1, screen_size[0] // world.width)  # Tamaño de cada celda
+        self.screen = pygame.display.set_mode(screen_size)
+        self.clock = pygame.time.Clock()
+        self.frame_interval = 1.0 / fps if fps else 0.0
+        self.tps = tps  # None = la simulación corre sin límite
+        self.next_frame = 0.0
+
+        self.sprites = load_sprites(self.cell_size)
+
+        # Todas las celdas están sucias en el primer frame
+        world.track_changes = True
+        self.terrain = bytearray(world.terrain)  # Terreno pintado en el fondo
+        self.background = terrain_background(self.terrain, world.width, world.height, self.cell_size, screen_size)
+        self.dirty = set(range(world.width * world.height))
+
+    def on_tick(self, world):
+        """Acumula las celdas cambiadas y dibuja si toca frame; devuelve False si se cierra la ventana."""
+        self.dirty.update(world.changed)
+
+        now = time.perf_counter()
+        if now >= self.next_frame:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+            self.display(world)
+            self.next_frame = now + self.frame_interval
+
+        # Controlar la velocidad de la simulación
+        if self.tps:
+            self.clock.tick(self.tps)
+        return True
+
+    def display(self, world):
+        """Redibuja las celdas sucias y actualiza sólo sus rectángulos en pantalla."""
+        cells = sorted(self.dirty)
+        terrain, painted = world.terrain, self.terrain
+        changed = [i for i in cells if terrain[i] != painted[i]]  # También bajo las entidades
+        if changed:
+            codes = [terrain[i] for i in changed]
+            paint_terrain(self.background, self.width, self.cell_size, changed, codes)
+            for i, code in zip(changed, codes):
+                painted[i] = code
+        rects = draw_cells(self.screen, self.background, self.sprites, self.width, self.cell_size,
+                           cells, world.get_cell_codes(cells))
+        self.dirty.clear()
+
+        if len(rects) > MAX_DIRTY_RECTS:
+            pygame.display.update()  # Actualizar la pantalla entera
+        elif rects:
+            pygame.display.update(rects)
+
+    def close(self):
+        """Cierra la ventana de Pygame."""
+        pygame.quit()
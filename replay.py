@@ -0,0 +1,181 @@
+#replay.py
+import argparse
+import os
+import time
+from recorder import RecordingReader
+
+SCREEN_SIZE = 1024  # Lado de la ventana en píxeles (como render.SCREEN_SIZE)
+MAX_SPEED = 1 << 16  # Ticks por segundo como máximo al reproducir
+
+
+class ReplayCanvas:
+    """Superficie de Pygame con un frame de la grabación; al cambiar de frame sólo redibuja las celdas distintas.
+
+    El fondo se pinta con el terreno grabado y se repinta en las celdas donde cambia.
+    """
+
+    def __init__(self, reader, cell_size, surface=None):
+        import numpy as np
+        import pygame
+        from render import load_sprites, terrain_background
+
+        self.reader = reader
+        self.cell_size = cell_size
+        size = (reader.width * cell_size, reader.height * cell_size)
+        self.surface = surface if surface is not None else pygame.Surface(size)
+        self.terrain = np.frombuffer(reader.terrain(0), dtype=np.uint8)  # Terreno pintado en el fondo
+        self.background = terrain_background(self.terrain, reader.width, reader.height, cell_size, size)
+        self.sprites = load_sprites(cell_size)
+        self.shown = None  # Códigos del frame dibujado
+
+    def show(self, position):
+        """Dibuja el frame en la posición `position` del índice; devuelve los rectángulos que han cambiado."""
+        import numpy as np
+        from render import draw_cells, paint_terrain
+
+        codes = np.frombuffer(self.reader.frame(position), dtype=np.uint8)
+        terrain = np.frombuffer(self.reader.terrain(position), dtype=np.uint8)
+        repainted = terrain != self.terrain
+        if repainted.any():
+            cells = np.flatnonzero(repainted)
+            paint_terrain(self.background, self.reader.width, self.cell_size, cells.tolist(), terrain[cells].tolist())
+        self.terrain = terrain
+        cells = np.arange(codes.size) if self.shown is None else np.flatnonzero((codes != self.shown) | repainted)
+        self.shown = codes
+        return draw_cells(self.surface, self.background, self.sprites, self.reader.width, self.cell_size,
+                          cells.tolist(), codes[cells].tolist())
+
+
+def play(reader, speed=10.0, fps=30, cell_size=None):
+    """Reproduce la grabación en una ventana; la posición avanza `speed` ticks por segundo (negativo: hacia atrás).
+
+    Controles: espacio pausa, ←/→ un tick, ↑/↓ dobla o divide la velocidad, R invierte el sentido,
+    Inicio/Fin y RePág/AvPág saltan, un clic salta a la posición proporcional a la x del ratón, Esc sale.
+    """
+    import pygame
+    from render import MAX_DIRTY_RECTS
+
+    cell_size = cell_size or max(1, SCREEN_SIZE // max(reader.width, reader.height))
+    pygame.init()
+    screen = pygame.display.set_mode((reader.width * cell_size, reader.height * cell_size))
+    canvas = ReplayCanvas(reader, cell_size, screen)
+    clock = pygame.time.Clock()
+    last = len(reader) - 1
+    jump = max(1, len(reader) // 10)
+    position = 0.0  # Posición en el índice de frames (fraccionaria a velocidades bajas)
+    shown = None
+    paused = False
+    try:
+        while True:
+            elapsed = clock.tick(fps) / 1000.0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    position = float(round(event.pos[0] / max(1, screen.get_width() - 1) * last))
+                if event.type != pygame.KEYDOWN:
+                    continue
+                key = event.key
+                if key in (pygame.K_ESCAPE, pygame.K_q):
+                    return
+                if key == pygame.K_SPACE:
+                    paused = not paused
+                elif key in (pygame.K_RIGHT, pygame.K_LEFT):
+                    paused = True
+                    position = float(int(position) + (1 if key == pygame.K_RIGHT else -1))
+                elif key == pygame.K_UP:
+                    speed = max(-MAX_SPEED, min(MAX_SPEED, speed * 2))
+                elif key == pygame.K_DOWN:
+                    speed /= 2
+                elif key == pygame.K_r:
+                    speed = -speed
+                elif key == pygame.K_HOME:
+                    position = 0.0
+                elif key == pygame.K_END:
+                    position = float(last)
+                elif key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    position += jump if key == pygame.K_PAGEDOWN else -jump
+
+            if not paused:
+                position += speed * elapsed
+                if position <= 0 or position >= last:
+                    paused = True  # Se detiene al llegar a un extremo
+            position = min(max(position, 0.0), float(last))
+
+            # Sólo se descodifica el frame de destino: a velocidad alta se saltan los intermedios
+            target = int(position)
+            if target != shown:
+                rects = canvas.show(target)
+                shown = target
+                if len(rects) > MAX_DIRTY_RECTS:
+                    pygame.display.update()
+                elif rects:
+                    pygame.display.update(rects)
+            state = "pausa" if paused else f"{speed:+g} ticks/s"
+            pygame.display.set_caption(f"Tick {reader.ticks[target]} ({target + 1}/{last + 1}) - {state}")
+    finally:
+        pygame.quit()
+
+
+def export_png(reader, ticks, directory, cell_size=None):
+    """Guarda una imagen PNG por tick en `directory` sin abrir ninguna ventana; devuelve cuántas escribe."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Sin pantalla (servidores, CI)
+    import pygame
+
+    cell_size = cell_size or max(1, SCREEN_SIZE // max(reader.width, reader.height))
+    os.makedirs(directory, exist_ok=True)
+    canvas = ReplayCanvas(reader, cell_size)
+    count = 0
+    for tick in ticks:
+        canvas.show(reader.position(tick))
+        pygame.image.save(canvas.surface, os.path.join(directory, f"tick_{tick:06d}.png"))
+        count += 1
+    return count
+
+
+def parse_ticks(spec, reader):
+    """Ticks de una especificación 'inicio:fin[:paso]' (fin excluido, como un slice) o 'a,b,c'."""
+    if spec is None:
+        return list(reader.ticks)
+    if ":" in spec:
+        parts = [int(part) if part else None for part in spec.split(":")]
+        if len(parts) > 3:
+            raise ValueError(f"Rango de ticks no válido: {spec}")
+        first, end = reader.ticks[0], reader.ticks[-1] + 1
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) == 3 and parts[2] is not None else 1
+        return list(range(first if start is None else start, end if stop is None else min(stop, end), step))
+    return [int(part) for part in spec.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce una grabación .vida o exporta ticks a PNG.")
+    parser.add_argument("recording", help="archivo de grabación (.vida)")
+    parser.add_argument("--speed", type=float, default=10.0, help="ticks por segundo al empezar (negativo: hacia atrás)")
+    parser.add_argument("--fps", type=float, default=30, help="frames por segundo como máximo")
+    parser.add_argument("--cell-size", type=int, default=None, help="píxeles por celda (por defecto caben en 1024)")
+    parser.add_argument("--png", default=None, help="exportar a este directorio sin ventana en vez de reproducir")
+    parser.add_argument("--ticks", default=None,
+                        help="ticks a exportar: 'inicio:fin[:paso]' o lista 'a,b,c' (todos por defecto)")
+    args = parser.parse_args(argv)
+
+    with RecordingReader(args.recording) as reader:
+        if not len(reader):
+            parser.error(f"{args.recording} no tiene frames")
+        if args.png is None:
+            play(reader, args.speed, args.fps, args.cell_size)
+            return
+        try:
+            ticks = parse_ticks(args.ticks, reader)
+        except ValueError as error:
+            parser.error(str(error))
+        missing = [tick for tick in ticks if tick not in reader]
+        if missing:
+            parser.error(f"La grabación no tiene los ticks {missing[:10]}")
+        start = time.perf_counter()
+        count = export_png(reader, ticks, args.png, args.cell_size)
+        print(f"{count} imágenes guardadas en '{args.png}' ({time.perf_counter() - start:.2f} s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#rng.py
+import random
+
+# Generador basado en contadores: cada número aleatorio es un hash de
+# (semilla, flujo, tick, clave, sorteo), así que no depende del orden en que se
+# pidan. El mismo valor sale en serie, vectorizado con NumPy o en otro proceso.
+MASK = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+# Flujos (subsistemas) de la simulación
+TERRAIN, POPULATE, MOVE, FEED, DEATH, REPRODUCE, GROW, FUNGI, SPAWN = range(9)
+
+
+def _mix(z):
+    """Paso de SplitMix64 sobre un entero de 64 bits."""
+    z = (z + GOLDEN) & MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+
+def new_seed():
+    """Semilla aleatoria para mundos creados sin semilla explícita."""
+    return random.randrange(1 << 63)
+
+
+class RandomStreams:
+    """Números aleatorios reproducibles por (semilla, flujo, tick, clave, sorteo).
+
+    La clave suele ser el id de la entidad o el índice de la celda; `draw`
+    distingue varios sorteos de la misma clave en el mismo tick.
+    """
+
+    def __init__(self, seed, streams=9):
+        self.seed = seed
+        root = _mix(seed & MASK)
+        self.stream_bases = [_mix(root ^ stream) for stream in range(streams)]
+        self.tick = None
+        self.bases = None
+        self.begin_tick(0)
+
+    def begin_tick(self, tick):
+        """Prepara los flujos para el tick indicado (llamar al inicio de cada tick)."""
+        if tick != self.tick:
+            self.tick = tick
+            self.bases = [_mix(base ^ (tick & MASK)) for base in self.stream_bases]
+
+    def bits(self, stream, key, draw=0):
+        """Entero aleatorio de 64 bits."""
+        return _mix(_mix(self.bases[stream] ^ (key & MASK)) ^ draw)
+
+    def random(self, stream, key, draw=0):
+        """Flotante uniforme en [0, 1)."""
+        return (self.bits(stream, key, draw) >> 11) * (1.0 / (1 << 53))
+
+    def randrange(self, stream, key, n, draw=0):
+        """Entero uniforme en [0, n)."""
+        return int(self.random(stream, key, draw) * n)
+
+    def randint(self, stream, key, a, b, draw=0):
+        """Entero uniforme en [a, b], ambos incluidos."""
+        return a + self.randrange(stream, key, b - a + 1, draw)
+
+    def choice(self, stream, key, seq, draw=0):
+        """Elemento aleatorio de una secuencia no vacía."""
+        return seq[self.randrange(stream, key, len(seq), draw)]
+
+    def random_array(self, stream, keys, draw=0):
+        """Versión vectorizada de `random` para un array de claves (requiere NumPy).
+
+        Devuelve exactamente los mismos valores que `random` para cada clave.
+        """
+        import numpy as np
+
+        z = np.asarray(keys).astype(np.uint64) ^ np.uint64(self.bases[stream])
+        z = _mix_array(_mix_array(z) ^ np.uint64(draw))
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class BatchStreams:
+    """Los flujos de RandomStreams de un lote de mundos, cada uno con su semilla y su tick (requiere NumPy).
+
+    El sorteo de la clave `k` del mundo `n` es el mismo que daría RandomStreams(seeds[n]) en el tick ticks[n].
+    """
+
+    def __init__(self, seeds, streams=9):
+        import numpy as np
+
+        self.streams = streams
+        self.stream_bases = np.zeros((streams, len(seeds)), dtype=np.uint64)
+        self.bases = None
+        self.seed(np.arange(len(seeds)), seeds)
+
+    def seed(self, worlds, seeds):
+        """Cambia la semilla de los mundos indicados."""
+        import numpy as np
+
+        root = _mix_array(np.array([s & MASK for s in seeds], dtype=np.uint64))
+        for stream in range(self.streams):
+            self.stream_bases[stream, worlds] = _mix_array(root ^ np.uint64(stream))
+
+    def begin_tick(self, ticks):
+        """Prepara los flujos de cada mundo para su tick (array con un tick por mundo)."""
+        import numpy as np
+
+        self.bases = _mix_array(self.stream_bases ^ np.asarray(ticks).astype(np.uint64))
+
+    def random_array(self, stream, worlds, keys, draw=0):
+        """Flotantes uniformes en [0, 1) para las claves `keys` de los mundos `worlds` (misma forma o difundible)."""
+        import numpy as np
+
+        z = np.asarray(keys).astype(np.uint64) ^ self.bases[stream][worlds]
+        z = _mix_array(_mix_array(z) ^ np.uint64(draw))
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def _mix_array(z):
+    """SplitMix64 sobre un array uint64 (el desbordamiento es módulo 2**64)."""
+    import numpy as np
+
+    z = z + np.uint64(GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
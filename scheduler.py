@@ -0,0 +1,79 @@
+#scheduler.py
+
+WHEEL_BITS = 6  # 64 casillas por nivel
+WHEEL_LEVELS = 4  # 64 ** 4 ticks (~16 millones) antes de recurrir a la lista de desbordamiento
+
+
+class TimingWheel:
+    """Rueda de temporización jerárquica: programa elementos para un tick futuro y entrega los de cada tick.
+
+    El nivel 0 tiene una casilla por tick; cada nivel superior cubre 64 veces más ticks.
+    Un elemento se guarda en el nivel más bajo donde su tick difiere del actual y baja
+    de nivel (cascada) cuando el tick actual alcanza su casilla. Programar es O(1) y
+    cada elemento baja como mucho WHEEL_LEVELS veces.
+    """
+
+    def __init__(self, tick=0, bits=WHEEL_BITS, levels=WHEEL_LEVELS):
+        self.tick = tick  # Próximo tick que entregará advance()
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.levels = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        self.overflow = []  # Elementos más allá del último nivel
+        self.size = 0
+
+    def copy(self):
+        other = TimingWheel.__new__(TimingWheel)
+        other.tick, other.bits, other.mask, other.size = self.tick, self.bits, self.mask, self.size
+        other.levels = [[list(slot) for slot in level] for level in self.levels]
+        other.overflow = list(self.overflow)
+        return other
+
+    def schedule(self, due, item):
+        """Programa `item` para el tick `due` (no anterior al próximo tick que se entregará)."""
+        if due < self.tick:
+            raise ValueError(f"No se puede programar en el tick {due}: la rueda ya va por el {self.tick}")
+        self.size += 1
+        self._insert(due, item)
+
+    def _insert(self, due, item):
+        level = ((due ^ self.tick).bit_length() - 1) // self.bits if due != self.tick else 0
+        if level >= len(self.levels):
+            self.overflow.append((due, item))
+        else:
+            self.levels[level][(due >> (self.bits * level)) & self.mask].append((due, item))
+
+    def advance(self):
+        """Devuelve los elementos programados para el tick actual (en orden de llegada) y pasa al siguiente."""
+        tick = self.tick
+        # Cascada de arriba abajo: las casillas superiores que empiezan en este tick se reparten en las inferiores
+        for level in range(len(self.levels), 0, -1):
+            if tick & ((1 << (self.bits * level)) - 1):
+                continue
+            if level == len(self.levels):
+                pending, self.overflow = self.overflow, []
+            else:
+                slots = self.levels[level]
+                index = (tick >> (self.bits * level)) & self.mask
+                pending, slots[index] = slots[index], []
+            for due, item in pending:
+                self._insert(due, item)
+
+        slots = self.levels[0]
+        due, slots[tick & self.mask] = slots[tick & self.mask], []
+        self.tick += 1
+        self.size -= len(due)
+        return [item for _, item in due]
+
+    def items(self):
+        """(tick, elemento) de todos los elementos pendientes.
+
+        Programándolos en este orden en una rueda nueva con el mismo tick se obtiene la misma rueda
+        (cada elemento está en el nivel que le corresponde respecto al tick actual).
+        """
+        for level in self.levels:
+            for slot in level:
+                yield from slot
+        yield from self.overflow
+
+    def __len__(self):
+        return self.size
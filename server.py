@@ -0,0 +1,312 @@
+#server.py
+import argparse
+import asyncio
+import itertools
+import multiprocessing as mp
+import struct
+import time
+from array import array
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+from ensemble import ENGINES, make_engine
+from websocket import server_handshake, read_frame, encode_frame, BINARY, CLOSE, PING, PONG
+
+# Mensajes del servidor (binarios): cabecera FRAME y después
+#   KEYFRAME: width * height códigos de celda (1 byte, ver world.CELL_LABELS)
+#   DELTA:    `cells` índices uint32 de las celdas cambiadas seguidos de sus `cells` códigos
+# `sent` es la hora (time.time()) a la que el servidor generó el frame.
+FRAME = struct.Struct("<BIdHHI")  # tipo, tick, sent, width, height, cells
+KEYFRAME, DELTA = 0, 1
+QUEUE_FRAMES = 8  # Frames pendientes por cliente; si se llenan se descartan y se reenvía un keyframe
+# Parámetros de una sesión (en la URL: /session/<nombre>?width=64&animals=20...) y sus valores por defecto
+DEFAULTS = {"engine": "world", "width": 24, "height": 24, "plants": 1, "animals": 1, "fungi": 1,
+            "seed": None, "tps": 10.0}
+MAX_SIDE = 4096
+
+
+def encode_keyframe(tick, width, height, codes):
+    return FRAME.pack(KEYFRAME, tick, time.time(), width, height, width * height) + bytes(codes)
+
+
+def encode_delta(tick, width, height, cells, codes):
+    """`cells` son los índices en bytes (array('I')) y `codes` un byte por celda."""
+    return FRAME.pack(DELTA, tick, time.time(), width, height, len(codes)) + cells + codes
+
+
+def decode_frame(data):
+    """Devuelve (tipo, tick, sent, width, height, índices, códigos); en un keyframe los índices son None."""
+    kind, tick, sent, width, height, count = FRAME.unpack_from(data)
+    body = memoryview(data)[FRAME.size:]
+    if kind == KEYFRAME:
+        return kind, tick, sent, width, height, None, bytes(body)
+    cells = array('I')
+    cells.frombytes(body[:4 * count])
+    return kind, tick, sent, width, height, cells, bytes(body[4 * count:])
+
+
+def parse_config(query):
+    """Configuración de una sesión a partir de la query de la URL; ValueError si no es válida."""
+    config = dict(DEFAULTS)
+    for name, values in parse_qs(query).items():
+        if name not in DEFAULTS:
+            raise ValueError(f"Parámetro desconocido: {name}")
+        value = values[-1]
+        if name == "engine":
+            if value not in ENGINES:
+                raise ValueError(f"Motor desconocido: {value}")
+            config[name] = value
+        else:
+            config[name] = float(value) if name == "tps" else int(value)
+    if not (2 <= config["width"] <= MAX_SIDE and 2 <= config["height"] <= MAX_SIDE):
+        raise ValueError(f"La cuadrícula debe medir entre 2 y {MAX_SIDE} celdas por lado")
+    if config["tps"] <= 0 or min(config["plants"], config["animals"], config["fungi"]) < 0:
+        raise ValueError("tps debe ser positivo y las poblaciones no negativas")
+    return config
+
+
+def _worker(conn):
+    """Proceso de trabajo: crea los mundos de sus sesiones y ejecuta sus ticks cuando se le piden."""
+    worlds = {}
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        request, command, session, *args = message
+        try:
+            if command == "create":
+                config, = args
+                world = make_engine(config["engine"], config["seed"], config["width"], config["height"])
+                world.populate(config["plants"], config["animals"], config["fungi"])
+                world.track_changes = True
+                worlds[session] = world
+                result = (world.tick, bytes(world.get_grid_codes()))
+            elif command == "step":
+                world = worlds[session]
+                world.update()
+                cells = sorted(world.changed)
+                result = (world.tick, array('I', cells).tobytes(), bytes(world.get_cell_codes(cells)))
+            else:  # "close"
+                worlds.pop(session, None)
+                result = None
+            conn.send((request, None, result))
+        except Exception as exc:
+            conn.send((request, repr(exc), None))
+
+
+class WorkerPool:
+    """Procesos que ejecutan los ticks de las sesiones sin bloquear el bucle de eventos.
+
+    Cada sesión vive siempre en el mismo proceso (su mundo no se copia entre procesos);
+    las respuestas llegan por tuberías vigiladas por el propio bucle de asyncio.
+    """
+
+    def __init__(self, workers):
+        self.loop = asyncio.get_running_loop()
+        self.connections = []
+        self.processes = []
+        self.pending = {}  # Petición -> futuro que espera su respuesta
+        self.requests = itertools.count()
+        for _ in range(workers):
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_worker, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.loop.add_reader(parent.fileno(), self._receive, parent)
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def _receive(self, conn):
+        while conn.poll():
+            request, error, result = conn.recv()
+            future = self.pending.pop(request)
+            if future.cancelled():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    def call(self, worker, command, session, *args):
+        """Envía una orden al proceso `worker` y devuelve un futuro con su resultado."""
+        request = next(self.requests)
+        future = self.loop.create_future()
+        self.pending[request] = future
+        self.connections[worker].send((request, command, session) + args)
+        return future
+
+    def close(self):
+        for conn in self.connections:
+            self.loop.remove_reader(conn.fileno())
+            conn.send(None)
+        for process in self.processes:
+            process.join()
+        for conn in self.connections:
+            conn.close()
+
+
+class Client:
+    """Suscriptor de una sesión con su cola de frames pendientes."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.frames = deque()
+        self.wake = asyncio.Event()
+        self.dropped = 0  # Frames descartados por ir lento
+
+    def send(self, message, session):
+        """Encola un mensaje; si el cliente acumula demasiados, los descarta y lo resincroniza con un keyframe."""
+        if len(self.frames) >= QUEUE_FRAMES:
+            self.dropped += len(self.frames)
+            self.frames.clear()
+            message = session.keyframe_message()
+        self.frames.append(message)
+        self.wake.set()
+
+    async def send_loop(self):
+        """Escribe los frames en orden; drain() frena al cliente lento sin afectar a los demás."""
+        try:
+            while True:
+                if not self.frames:
+                    self.wake.clear()
+                    await self.wake.wait()
+                    continue
+                self.writer.write(self.frames.popleft())
+                await self.writer.drain()
+        except ConnectionError:
+            pass  # El cliente se desconectó; la lectura de su conexión termina la suscripción
+
+
+class Session:
+    """Un mundo que avanza a `tps` ticks por segundo mientras tenga suscriptores."""
+
+    def __init__(self, name, config, worker):
+        self.name = name
+        self.config = config
+        self.worker = worker
+        self.width = config["width"]
+        self.height = config["height"]
+        self.clients = set()
+        self.tick = 0
+        self.codes = None  # Copia de la cuadrícula para enviar keyframes a clientes nuevos o lentos
+        self.ready = asyncio.Event()
+
+    def keyframe_message(self):
+        return encode_frame(BINARY, encode_keyframe(self.tick, self.width, self.height, self.codes))
+
+    async def run(self, pool, sessions):
+        """Crea el mundo en su proceso y lo avanza; al quedarse sin suscriptores lo elimina."""
+        loop = asyncio.get_running_loop()
+        try:
+            self.tick, codes = await pool.call(self.worker, "create", self.name, self.config)
+            self.codes = bytearray(codes)
+        except RuntimeError:
+            del sessions[self.name]
+            return
+        finally:
+            self.ready.set()
+
+        interval = 1.0 / self.config["tps"]
+        next_tick = loop.time()
+        try:
+            while self.clients:
+                self.tick, cells, codes = await pool.call(self.worker, "step", self.name)
+                for i, code in zip(array('I', cells), codes):
+                    self.codes[i] = code
+                message = encode_frame(BINARY, encode_delta(self.tick, self.width, self.height, cells, codes))
+                for client in list(self.clients):
+                    client.send(message, self)
+
+                # Ritmo fijo; si la sesión va con retraso no intenta recuperar los ticks perdidos
+                next_tick = max(next_tick + interval, loop.time())
+                await asyncio.sleep(next_tick - loop.time())
+        finally:
+            del sessions[self.name]
+            for client in self.clients:  # Sólo quedan clientes si el tick falló
+                client.writer.close()
+        await pool.call(self.worker, "close", self.name)
+
+
+class SimulationServer:
+    """Servidor WebSocket: cada conexión a /session/<nombre> se suscribe a esa sesión (creándola si no existe)."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.pool = None
+        self.sessions = {}
+        self.next_worker = itertools.cycle(range(workers))
+
+    async def handle(self, reader, writer):
+        try:
+            path = await server_handshake(reader, writer)
+            url = urlsplit(path)
+            prefix, _, name = url.path.partition("/session/")
+            if prefix or not name:
+                raise ValueError(f"Ruta desconocida: {url.path}")
+            session = self.sessions.get(name)
+            if session is None:
+                session = Session(name, parse_config(url.query), next(self.next_worker))
+                self.sessions[name] = session
+                asyncio.create_task(session.run(self.pool, self.sessions))
+        except (ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as exc:
+            self.reject(writer, 1008, exc)
+            return
+
+        # Se suscribe antes de que exista el mundo: una sesión nueva no termina sin su primer cliente
+        client = Client(writer)
+        session.clients.add(client)
+        await session.ready.wait()
+        if session.codes is None:
+            session.clients.discard(client)
+            self.reject(writer, 1011, "No se pudo crear la sesión")
+            return
+        client.frames.clear()
+        client.send(session.keyframe_message(), session)
+        sender = asyncio.create_task(client.send_loop())
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == CLOSE:
+                    writer.write(encode_frame(CLOSE, payload[:2]))
+                    break
+                if opcode == PING:
+                    client.frames.appendleft(encode_frame(PONG, payload))
+                    client.wake.set()
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            session.clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    def reject(self, writer, code, reason):
+        """Cierra una conexión que no puede suscribirse indicando el motivo."""
+        if not writer.is_closing():
+            writer.write(encode_frame(CLOSE, struct.pack(">H", code) + str(reason).encode()[:120]))
+            writer.close()
+
+    async def serve(self, host, port):
+        self.pool = WorkerPool(self.workers)
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Servidor de simulación en ws://{host}:{port}/session/<nombre> ({self.workers} procesos)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor WebSocket de sesiones de simulación.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="procesos de simulación (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(SimulationServer(args.workers or mp.cpu_count()).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#stats.py
+import csv
+from entity import Kind, LIVE
+
+# Tipos de entidad en el orden de world.POPULATION_KINDS (Kind sin EMPTY)
+KINDS = tuple(kind for kind in Kind if kind != Kind.EMPTY)
+KIND_NAMES = ("PlantLow", "PlantHigh", "AnimalSmall", "AnimalBig", "Fungi")
+# Contadores de cada tipo: poblaciones actuales y eventos acumulados desde el inicio
+COUNTERS = ("live", "dead", "births", "deaths", "promotions", "corpses_cleared")
+
+
+class PopulationStats:
+    """Poblaciones y eventos por tipo, mantenidos por World a medida que ocurren (sin recorrer la cuadrícula).
+
+    Cada contador es una lista indexada por entity.Kind. Los eventos son acumulados:
+    la diferencia entre dos filas del flujo da los eventos del intervalo.
+    """
+
+    def __init__(self):
+        for name in COUNTERS:
+            setattr(self, name, [0] * len(Kind))
+
+    def copy(self):
+        """Copia independiente de los contadores."""
+        other = PopulationStats()
+        for name in COUNTERS:
+            setattr(other, name, list(getattr(self, name)))
+        return other
+
+    def added(self, entity):
+        """Una entidad entra en la simulación (viva: nacimiento)."""
+        if entity.state == LIVE:
+            self.live[entity.kind] += 1
+            self.births[entity.kind] += 1
+        else:
+            self.dead[entity.kind] += 1
+
+    def died(self, kind):
+        """Una entidad viva del tipo muere."""
+        self.live[kind] -= 1
+        self.dead[kind] += 1
+        self.deaths[kind] += 1
+
+    def promoted(self, old, new):
+        """Cambio de clase dentro de la familia (PlantLow -> PlantHigh, AnimalSmall -> AnimalBig)."""
+        self.live[old] -= 1
+        self.live[new] += 1
+        self.promotions[old] += 1
+
+    def buried(self, kind):
+        """Aparece un hongo sobre un cadáver del tipo: el cadáver deja de estar expuesto."""
+        self.dead[kind] -= 1
+
+    def cleared(self, kind):
+        """Un hongo elimina el cadáver del tipo que tenía debajo."""
+        self.corpses_cleared[kind] += 1
+
+    def removed(self, entity):
+        """Una entidad sale de la simulación (viva: un hongo sin hp, que muere sin dejar cadáver; muerta: cadáver eliminado)."""
+        if entity.state == LIVE:
+            self.live[entity.kind] -= 1
+            self.deaths[entity.kind] += 1
+        else:
+            self.dead[entity.kind] -= 1
+            self.corpses_cleared[entity.kind] += 1
+
+    def columns(self):
+        """Nombres de las columnas de `row`, p. ej. live_PlantLow."""
+        return [f"{name}_{kind}" for name in COUNTERS for kind in KIND_NAMES]
+
+    def row(self):
+        """Valores de todos los contadores, en el orden de `columns`."""
+        values = []
+        for name in COUNTERS:
+            counter = getattr(self, name)
+            values.extend(counter[kind] for kind in KINDS)
+        return values
+
+
+class StatsWriter:
+    """Observador que escribe las estadísticas de población cada `stride` ticks en un CSV (una columna por contador)."""
+
+    def __init__(self, path, stride=1):
+        self.stride = stride
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.world = None
+        self.written = None  # Último tick escrito
+
+    def on_tick(self, world):
+        """Escribe una fila cada `stride` ticks (la cabecera con el primer tick)."""
+        if self.world is None:
+            self.writer.writerow(["tick"] + world.stats.columns())
+        self.world = world
+        if world.tick % self.stride == 0:
+            self.write()
+
+    def write(self):
+        """Escribe la fila del tick actual: poblaciones y eventos acumulados."""
+        self.writer.writerow([self.world.tick] + self.world.stats.row())
+        self.written = self.world.tick
+
+    def close(self):
+        """Escribe el último tick si no cayó en el intervalo y cierra el archivo."""
+        if self.world is not None and self.written != self.world.tick:
+            self.write()
+        self.file.close()
@@ -0,0 +1,62 @@
+#terrain.py
+from rng import TERRAIN
+
+# Códigos de terreno (capa de 1 byte por celda; coinciden con los códigos 0-4 de world.CELL_LABELS)
+GROUND, ROCK, SOIL, SOIL_PLUS, WATER = range(5)
+TERRAIN_NAMES = ("ground", "rock", "soil", "soil+", "water")
+# Ciclo de tierra: una PlantHigh al morir degrada la celda y un hongo al eliminar un cadáver la enriquece
+DEGRADE = bytes([GROUND, ROCK, GROUND, SOIL, WATER])
+ENRICH = bytes([SOIL, ROCK, SOIL_PLUS, SOIL_PLUS, WATER])
+
+# Generación procedural: ruido de valor en varias octavas (cuadrículas de `scale`, scale/2...)
+SCALE = 32
+OCTAVES = 3
+WATER_LEVEL = 0.3  # Altura por debajo de la cual hay agua
+ROCK_LEVEL = 0.72  # Altura por encima de la cual hay roca
+SOIL_LEVEL = 0.5  # Humedad a partir de la cual hay soil...
+SOIL_PLUS_LEVEL = 0.65  # ...y soil+
+
+
+def _noise(rng, width, height, field, scale=SCALE, octaves=OCTAVES):
+    """Campo de ruido en [0, 1) de forma (height, width), suave a la escala indicada."""
+    import numpy as np
+
+    total = np.zeros((height, width), dtype=np.float32)
+    weight = 0.0
+    for octave in range(octaves):
+        step = max(1, scale >> octave)
+        gw, gh = width // step + 2, height // step + 2
+        # Un valor aleatorio por vértice de la retícula, por (campo, octava, vértice)
+        keys = np.arange(gw * gh, dtype=np.uint64) + np.uint64(((field * 16 + octave) << 40))
+        lattice = rng.random_array(TERRAIN, keys).astype(np.float32).reshape(gh, gw)
+
+        fx = np.arange(width, dtype=np.float32) / step
+        fy = np.arange(height, dtype=np.float32) / step
+        x0, y0 = fx.astype(np.intp), fy.astype(np.intp)
+        # Interpolación bilineal suavizada (smoothstep) entre los cuatro vértices
+        tx = fx - x0
+        ty = (fy - y0)[:, None]
+        tx, ty = tx * tx * (3 - 2 * tx), ty * ty * (3 - 2 * ty)
+        top = lattice[y0][:, x0] * (1 - tx) + lattice[y0][:, x0 + 1] * tx
+        bottom = lattice[y0 + 1][:, x0] * (1 - tx) + lattice[y0 + 1][:, x0 + 1] * tx
+        amplitude = 0.5 ** octave
+        total += (top * (1 - ty) + bottom * ty) * amplitude
+        weight += amplitude
+    return total / weight
+
+
+def procedural(width, height, rng):
+    """Terreno procedural para mapas grandes: lagos, macizos de roca y manchas de soil/soil+.
+
+    Devuelve un array uint8 plano de width * height códigos (requiere NumPy).
+    """
+    import numpy as np
+
+    elevation = _noise(rng, width, height, field=0)
+    moisture = _noise(rng, width, height, field=1)
+    terrain = np.full((height, width), GROUND, dtype=np.uint8)
+    terrain[moisture >= SOIL_LEVEL] = SOIL
+    terrain[moisture >= SOIL_PLUS_LEVEL] = SOIL_PLUS
+    terrain[elevation < WATER_LEVEL] = WATER
+    terrain[elevation > ROCK_LEVEL] = ROCK
+    return terrain.ravel()
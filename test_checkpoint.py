@@ -0,0 +1,73 @@
+#test_checkpoint.py
+import pytest
+from world import World
+from event_world import EventWorld
+from stats import COUNTERS
+
+
+def _assert_same_future(world, other, ticks=50):
+    """Los dos mundos siguen exactamente la misma evolución."""
+    for _ in range(ticks):
+        world.update()
+        other.update()
+        assert world.tick == other.tick
+        assert world.get_grid_codes() == other.get_grid_codes()
+        assert world.population_counts() == other.population_counts()
+
+
+@pytest.mark.parametrize("engine", [World, EventWorld])
+@pytest.mark.parametrize("seed", range(4))
+def test_world_round_trip(engine, seed, tmp_path):
+    world = engine(24, 24, seed=seed)
+    world.populate(10, 8, 3)
+    world.run(6)
+    path = tmp_path / "world.ckp"
+    world.save_checkpoint(path)
+    loaded = engine.load_checkpoint(path)
+    assert type(loaded) is engine
+    for name in COUNTERS:  # Los eventos acumulados continúan, igual que con fork()
+        assert getattr(loaded.stats, name) == getattr(world.stats, name)
+    _assert_same_future(world, loaded)
+    assert world.stats.row() == loaded.stats.row()
+
+
+def test_fork_matches_checkpoint(tmp_path):
+    world = World(24, 24, seed=9)
+    world.populate(10, 8, 3)
+    world.run(10)
+    world.save_checkpoint(tmp_path / "world.ckp")
+    _assert_same_future(world.fork(), World.load_checkpoint(tmp_path / "world.ckp"))
+
+
+def test_event_world_fork_matches_checkpoint(tmp_path):
+    world = EventWorld(24, 24, seed=9)
+    world.populate(10, 8, 3)
+    world.run(10)
+    world.save_checkpoint(tmp_path / "world.ckp")
+    _assert_same_future(world.fork(), EventWorld.load_checkpoint(tmp_path / "world.ckp"))
+
+
+def test_checkpoint_engine_mismatch(tmp_path):
+    World(8, 8, seed=1).save_checkpoint(tmp_path / "world.ckp")
+    EventWorld(8, 8, seed=1).save_checkpoint(tmp_path / "event.ckp")
+    with pytest.raises(ValueError):
+        EventWorld.load_checkpoint(tmp_path / "world.ckp")
+    with pytest.raises(ValueError):
+        World.load_checkpoint(tmp_path / "event.ckp")
+
+
+def test_array_world_round_trip(tmp_path):
+    np = pytest.importorskip("numpy")
+    from array_world import ArrayWorld, LAYERS
+
+    world = ArrayWorld(32, 24, seed=5)
+    world.populate(10, 8, 3)
+    for _ in range(10):
+        world.update()
+    world.save_checkpoint(tmp_path / "array.ckp")
+    loaded = ArrayWorld.load_checkpoint(tmp_path / "array.ckp")
+    for _ in range(40):
+        world.update()
+        loaded.update()
+    assert loaded.tick == world.tick
+    assert all(np.array_equal(getattr(world, name), getattr(loaded, name)) for name in LAYERS)
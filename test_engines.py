@@ -0,0 +1,69 @@
+#test_engines.py
+from array_world import compare_engines, max_relative_difference, total_relative_difference
+
+# Mapa procedural de 48x48 con población densa: los cinco tipos siguen vivos del tick 20 al 30
+# (AnimalBig aparece a los 12 ticks de los AnimalSmall y PlantHigh a los 16-24 de las PlantLow), así se comparan todas las reglas
+SCENARIO = dict(width=48, height=48, num_plants=300, num_animals=150, num_fungi=30, terrain="procedural")
+TICKS = 30
+TICK_TOLERANCE = 0.2  # Diferencia relativa máxima en cada tick (las medias de animales son ruidosas)
+TOTAL_TOLERANCE = 0.08  # Diferencia relativa máxima de la población acumulada
+
+
+def test_array_world_matches_world():
+    """ArrayWorld y World aplican las mismas reglas: sus poblaciones medias coinciden en pocos puntos porcentuales."""
+    result = compare_engines(range(80), TICKS, **SCENARIO)
+    for label, (world_means, array_means) in result.items():
+        assert min(world_means[20:]) >= 1 and min(array_means[20:]) >= 1, f"{label} no sigue vivo"
+        diff = max_relative_difference(world_means, array_means)
+        assert diff <= TICK_TOLERANCE, f"{label}: diferencia por tick {diff:.1%}"
+        total = total_relative_difference(world_means, array_means)
+        assert total <= TOTAL_TOLERANCE, f"{label}: diferencia acumulada {total:.1%}"
+
+
+def test_tiled_world_matches_array_world():
+    """Las franjas en paralelo producen exactamente las mismas capas que ArrayWorld."""
+    import numpy as np
+    from array_world import ArrayWorld, LAYERS
+    from tiled import TiledWorld
+
+    world = ArrayWorld(48, 64, seed=7)
+    world.populate(2, 400, 40)
+    tiled = TiledWorld(48, 64, seed=7, workers=3)
+    try:
+        tiled.populate(2, 400, 40)
+        for _ in range(3):
+            for _ in range(10):
+                world.update()
+            tiled.step(10)
+            for name in LAYERS:
+                assert np.array_equal(getattr(world, name), getattr(tiled.view, name)), name
+    finally:
+        tiled.close()
+
+
+def test_vector_world_matches_array_world():
+    """Cada mundo del lote evoluciona igual que un ArrayWorld con su semilla, también al congelarlo y reiniciarlo."""
+    import numpy as np
+    from array_world import ArrayWorld
+    from vector_world import VectorWorld
+
+    seeds = [3, 11, 2 ** 40 + 1, 7]
+    batch = VectorWorld(len(seeds), 13, 9, seeds=seeds, populations=(20, 15, 3))
+    worlds = [ArrayWorld(13, 9, seed=seed) for seed in seeds]
+    for world in worlds:
+        world.populate(20, 15, 3)
+    for tick in range(40):
+        if tick == 10:
+            batch.active[2] = False
+        if tick == 20:
+            batch.reset([1], seeds=[99])
+            worlds[1] = ArrayWorld(13, 9, seed=99)
+            worlds[1].populate(20, 15, 3)
+        batch.update()
+        for n, world in enumerate(worlds):
+            if batch.active[n]:
+                world.update()
+        observed = batch.observe()
+        for n, world in enumerate(worlds):
+            assert np.array_equal(observed[n].ravel(), world._codes()), (tick, n)
+            assert tuple(batch.population_counts()[n]) == world.population_counts()
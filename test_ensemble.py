@@ -0,0 +1,42 @@
+#test_ensemble.py
+import random
+from array import array
+from ensemble import EnsembleStats, QUANTILES
+from world import POPULATION_KINDS
+
+KINDS = len(POPULATION_KINDS)
+
+
+def _run(*series):
+    """Contadores planos de una corrida con la serie dada para los primeros tipos (el resto a 0)."""
+    ticks = len(series[0])
+    counts = array('I', [0] * (ticks * KINDS))
+    for k, values in enumerate(series):
+        counts[k::KINDS] = array('I', values)
+    return counts
+
+
+def test_extinction_is_the_final_run_of_zeros():
+    stats = EnsembleStats(3)
+    stats.add(_run([0, 1, 0, 1], [3, 0, 0, 0]))  # Vuelve tras pasar por 0 / se extingue en el tick 1
+    stats.add(_run([1, 0, 1, 0], [2, 2, 2, 2]))  # Se extingue en el tick 3 / sigue vivo
+    kinds = stats.summary()["kinds"]
+    first, second, third = (kinds[name] for name in POPULATION_KINDS[:3])
+    assert first["extinction_ticks"] == {"3": 1, "never": 1}
+    assert first["extinction_probability"] == 0.5
+    assert second["extinction_ticks"] == {"1": 1, "never": 1}
+    assert third["never_appeared"] == 2 and third["extinction_ticks"] == {}
+    assert third["extinction_probability"] == 0.0
+
+
+def test_quantiles_match_sorted_runs():
+    rnd = random.Random(0)
+    runs = [[rnd.randrange(6) for _ in range(5)] for _ in range(37)]
+    stats = EnsembleStats(4)
+    for values in runs:
+        stats.add(_run(values))
+    quantiles = stats.summary()["kinds"][POPULATION_KINDS[0]]["quantiles"]
+    for t in range(5):
+        values = sorted(run[t] for run in runs)
+        for q in QUANTILES:
+            assert quantiles[str(q)][t] == values[min(len(values) - 1, int(q * len(values)))]
@@ -0,0 +1,57 @@
+#test_indexes.py
+import random
+from indexes import CellSet
+from rng import RandomStreams, POPULATE
+
+
+def _check(cells, expected):
+    """El conjunto disperso contiene exactamente `expected` y sus posiciones son coherentes."""
+    assert len(cells) == len(expected)
+    assert set(cells.cells) == expected
+    for p, i in enumerate(cells.cells):
+        assert cells.position[i] == p
+    assert all((i in cells) == (i in expected) for i in range(len(cells.position)))
+
+
+def test_cell_set_matches_set():
+    """Altas y bajas aleatorias (repetidas incluidas) dejan los mismos miembros que un set."""
+    rnd = random.Random(0)
+    cells, expected = CellSet(64), set()
+    for _ in range(2000):
+        i = rnd.randrange(64)
+        if rnd.random() < 0.5:
+            cells.add(i)
+            expected.add(i)
+        else:
+            cells.discard(i)
+            expected.discard(i)
+    _check(cells, expected)
+
+
+def test_cell_set_full_and_reset_order():
+    cells = CellSet(10, full=True)
+    _check(cells, set(range(10)))
+    cells.reset([7, 2, 5])
+    assert list(cells.cells) == [7, 2, 5]  # El orden decide qué celda sale en cada sorteo
+    _check(cells, {2, 5, 7})
+
+
+def test_cell_set_copy_is_independent():
+    cells = CellSet(10)
+    cells.add(3)
+    other = cells.copy()
+    other.add(4)
+    cells.discard(3)
+    _check(cells, set())
+    _check(other, {3, 4})
+
+
+def test_cell_set_sample():
+    rng = RandomStreams(1)
+    cells = CellSet(100)
+    assert cells.sample(rng, POPULATE, 0) is None
+    for i in (10, 20, 30):
+        cells.add(i)
+    samples = {cells.sample(rng, POPULATE, key) for key in range(200)}
+    assert samples == {10, 20, 30}
+    assert cells.sample(rng, POPULATE, 5) == cells.sample(rng, POPULATE, 5)  # Determinista por clave
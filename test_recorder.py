@@ -0,0 +1,105 @@
+#test_recorder.py
+import random
+import pytest
+from world import World
+from recorder import Recorder, RecordingReader, TRAILER
+
+
+class _Truth:
+    """Observador que guarda los códigos y el terreno de cada tick."""
+
+    def __init__(self):
+        self.frames = {}
+
+    def on_tick(self, world):
+        self.frames[world.tick] = (bytes(world.get_grid_codes()), bytes(world.terrain))
+        return True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(params=["none", "zlib"])
+def recording(request, tmp_path):
+    """Grabación de 150 ticks con keyframes cada 8 y los frames reales de cada tick."""
+    path = tmp_path / "run.vida"
+    world = World(32, 24, seed=3, terrain="procedural" if request.param == "zlib" else "minimal")
+    world.populate(10, 10, 3)
+    truth = _Truth()
+    world.attach(Recorder(path, keyframe_interval=8, compression=request.param))
+    world.attach(truth)
+    world.run(150)
+    return path, truth.frames
+
+
+def test_reader_index_and_frames(recording):
+    path, truth = recording
+    with RecordingReader(path) as reader:
+        assert list(reader.ticks) == sorted(truth)
+        assert all(codes == truth[tick][0] for tick, codes in reader.frames())
+        assert all(reader.terrain(reader.position(tick)) == truth[tick][1] for tick in truth)
+
+
+def test_reader_seek_any_order(recording):
+    path, truth = recording
+    ticks = sorted(truth)
+    random.Random(0).shuffle(ticks)
+    with RecordingReader(path, cached_segments=2) as reader:
+        for tick in ticks + sorted(truth, reverse=True):
+            assert reader.seek(tick) == truth[tick][0]
+        # Caché acotada: keyframe y último frame de cada tramo
+        assert len(reader.segments) <= 2
+        assert all(len(segment) == 3 for segment in reader.segments.values())
+        assert max(truth) + 1 not in reader
+        with pytest.raises(KeyError):
+            reader.seek(max(truth) + 1)
+
+
+def test_reader_without_index(recording, tmp_path):
+    """Grabación interrumpida: sin índice y con el último frame a medias."""
+    path, truth = recording
+    data = path.read_bytes()
+    position, count, _ = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+    truncated = tmp_path / "truncated.vida"
+    truncated.write_bytes(data[:position - 5])
+    with RecordingReader(truncated) as reader:
+        assert len(reader) == count - 1
+        assert all(reader.seek(tick) == truth[tick][0] for tick in reader.ticks)
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "other.vida"
+    path.write_bytes(b"not a recording at all")
+    with pytest.raises(ValueError):
+        RecordingReader(path)
+
+
+def test_record_tiled_world(tmp_path):
+    """Los observadores sólo usan la interfaz común: también se graba un TiledWorld."""
+    pytest.importorskip("numpy")
+    from tiled import TiledWorld
+
+    path = tmp_path / "tiled.vida"
+    world = TiledWorld(32, 24, seed=4, workers=2)
+    try:
+        world.populate(10, 10, 3)
+        truth = _Truth()
+        world.attach(Recorder(path, keyframe_interval=8))
+        world.attach(truth)
+        world.run(20)
+    finally:
+        world.close()
+    with RecordingReader(path) as reader:
+        assert list(reader.ticks) == sorted(truth.frames)
+        for tick, (codes, terrain) in truth.frames.items():
+            assert reader.seek(tick) == codes
+            assert reader.terrain(reader.position(tick)) == terrain
+
+
+@pytest.mark.parametrize("interval", [0, 70000])
+def test_recorder_rejects_keyframe_interval(interval, tmp_path):
+    """El intervalo se guarda como uint16: se rechaza antes de crear el archivo."""
+    path = tmp_path / "run.vida"
+    with pytest.raises(ValueError):
+        Recorder(path, keyframe_interval=interval)
+    assert not path.exists()
@@ -0,0 +1,68 @@
+#test_registry.py
+import random
+from registry import EntityStore, SLOT_MASK
+from plant import PlantLow, PlantHigh
+from animal import AnimalSmall
+
+
+def _check(store):
+    """Las listas compactas y los índices de cada entidad son coherentes."""
+    for i, entity in enumerate(store.dense):
+        assert entity.dense_index == i
+        assert store.get(entity.id) is entity
+    for cls, typed in store.by_type.items():
+        for i, entity in enumerate(typed):
+            assert entity.__class__ is cls and entity.type_index == i
+    assert sum(len(typed) for typed in store.by_type.values()) == len(store)
+
+
+def test_entity_store_add_remove():
+    rnd = random.Random(0)
+    store, alive = EntityStore(), []
+    for _ in range(500):
+        if alive and rnd.random() < 0.4:
+            entity = alive.pop(rnd.randrange(len(alive)))
+            assert store.remove(entity)
+            assert entity not in store
+        else:
+            entity = rnd.choice((PlantLow, AnimalSmall))(0, 0)
+            store.add(entity)
+            alive.append(entity)
+        _check(store)
+    assert set(map(id, store.dense)) == set(map(id, alive))
+
+
+def test_entity_store_stale_ids():
+    """Un slot reutilizado cambia de generación: el id antiguo ya no encuentra nada."""
+    store = EntityStore()
+    first = PlantLow(0, 0)
+    store.add(first)
+    old_id = first.id
+    store.remove(first)
+    assert not store.remove(first)
+    second = PlantLow(1, 1)
+    store.add(second)
+    assert second.id & SLOT_MASK == old_id & SLOT_MASK
+    assert second.id != old_id
+    assert store.get(old_id) is None
+    assert store.get(second.id) is second
+
+
+def test_entity_store_retype():
+    store = EntityStore()
+    plants = [PlantLow(i, 0) for i in range(3)]
+    for plant in plants:
+        store.add(plant)
+    store.retype(plants[0], PlantHigh)
+    assert store.of_type(PlantHigh) == [plants[0]]
+    assert set(map(id, store.of_type(PlantLow))) == {id(plants[1]), id(plants[2])}
+    _check(store)
+
+
+def test_entity_store_iter_is_a_copy():
+    store = EntityStore()
+    for i in range(4):
+        store.add(PlantLow(i, 0))
+    for entity in store:
+        store.remove(entity)  # Las bajas durante el recorrido no lo alteran
+    assert len(store) == 0
@@ -0,0 +1,54 @@
+#test_scheduler.py
+import random
+import pytest
+from scheduler import TimingWheel
+
+
+def _schedule_random(wheel, count, horizon, seed=0):
+    """Programa `count` elementos en ticks aleatorios; devuelve tick -> elementos en orden de llegada."""
+    rnd = random.Random(seed)
+    expected = {}
+    for item in range(count):
+        due = wheel.tick + rnd.randrange(horizon)
+        wheel.schedule(due, item)
+        expected.setdefault(due, []).append(item)
+    return expected
+
+
+def test_timing_wheel_delivers_on_due_tick():
+    """Elementos en todos los niveles y en la lista de desbordamiento (bits=2, levels=2: 16 ticks)."""
+    wheel = TimingWheel(bits=2, levels=2)
+    expected = _schedule_random(wheel, 300, 200)
+    for tick in range(200):
+        assert wheel.advance() == expected.get(tick, [])
+    assert len(wheel) == 0
+
+
+def test_timing_wheel_rejects_past_ticks():
+    wheel = TimingWheel(5)
+    with pytest.raises(ValueError):
+        wheel.schedule(4, "x")
+
+
+def test_timing_wheel_items_round_trip():
+    """Reprogramar items() en una rueda nueva con el mismo tick la reconstruye igual (checkpoints)."""
+    wheel = TimingWheel(bits=2, levels=2)
+    _schedule_random(wheel, 300, 200)
+    for _ in range(37):
+        wheel.advance()
+    other = TimingWheel(wheel.tick, bits=2, levels=2)
+    for due, item in wheel.items():
+        other.schedule(due, item)
+    assert len(other) == len(wheel)
+    assert other.levels == wheel.levels and other.overflow == wheel.overflow
+    for _ in range(200):
+        assert other.advance() == wheel.advance()
+
+
+def test_timing_wheel_copy_is_independent():
+    wheel = TimingWheel()
+    wheel.schedule(3, "a")
+    other = wheel.copy()
+    other.schedule(3, "b")
+    assert [wheel.advance() for _ in range(4)][3] == ["a"]
+    assert [other.advance() for _ in range(4)][3] == ["a", "b"]
@@ -0,0 +1,174 @@
+#tiled.py
+import argparse
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from world import Engine
+from array_world import ArrayWorld, LAYERS
+
+# Filas de halo a cada lado de una franja. Un error en el borde de la franja se
+# propaga como máximo: 6 filas al mover (origen a 3 celdas y rivales a 3 del destino),
+# 2 al alimentarse, 2 en la reproducción animal y 2 en la vegetal. Con 12 filas
+# las filas propias de cada franja son exactas y basta un intercambio por tick.
+HALO = 12
+
+
+def _attach(names, size):
+    """Abre las capas compartidas y devuelve (segmentos, arrays)."""
+    segments = {name: shared_memory.SharedMemory(name=names[name]) for name in LAYERS}
+    arrays = {name: np.ndarray(size, dtype=LAYERS[name], buffer=segments[name].buf) for name in LAYERS}
+    return segments, arrays
+
+
+def _worker(names, width, height, seed, rows, halo, barrier, commands, done):
+    """Proceso que avanza las filas [rows[0], rows[1]) del mundo compartido."""
+    segments, arrays = _attach(names, width * height)
+    r0, r1 = rows
+    lo, hi = max(0, r0 - halo), min(height, r1 + halo)
+    own = slice((r0 - lo) * width, (r1 - lo) * width)
+    try:
+        while True:
+            command = commands.get()
+            if command is None:
+                break
+            tick, count = command
+            for t in range(tick, tick + count):
+                # Copia local de la franja con su halo, avanzada como un mundo independiente
+                band = {name: arrays[name][lo * width:hi * width].copy() for name in LAYERS}
+                world = ArrayWorld(width, hi - lo, seed=seed, layers=band, offset=lo * width)
+                world.tick = t
+                world.update()
+                barrier.wait()  # Todas las franjas han leído el estado del tick
+                for name in LAYERS:
+                    arrays[name][r0 * width:r1 * width] = band[name][own]
+                barrier.wait()  # Todas las franjas han escrito el tick siguiente
+            done.put(r0)
+    finally:
+        for segment in segments.values():
+            segment.close()
+
+
+class TiledWorld(Engine):
+    """Mundo de arrays dividido en franjas de filas que avanzan en procesos paralelos sobre memoria compartida.
+
+    Produce exactamente el mismo resultado que ArrayWorld con la misma semilla.
+    """
+
+    def __init__(self, width=1024, height=1024, seed=None, workers=None, halo=HALO, terrain="minimal"):
+        super().__init__(width, height)
+        workers = min(workers or mp.cpu_count(), height)
+        size = width * height
+        self.segments = {name: shared_memory.SharedMemory(create=True, size=size * np.dtype(dtype).itemsize)
+                         for name, dtype in LAYERS.items()}
+        arrays = {name: np.ndarray(size, dtype=LAYERS[name], buffer=self.segments[name].buf) for name in LAYERS}
+        for array in arrays.values():
+            array[:] = 0
+
+        # Vista completa en el proceso principal: generación, población, códigos y contadores
+        self.view = ArrayWorld(width, height, seed=seed, layers=arrays)
+        self.view.generate_terrain(terrain)
+        self.seed = self.view.seed
+
+        bounds = [height * i // workers for i in range(workers + 1)]
+        barrier = mp.Barrier(workers)
+        self.done = mp.Queue()
+        self.commands = []
+        self.processes = []
+        names = {name: segment.name for name, segment in self.segments.items()}
+        for r0, r1 in zip(bounds, bounds[1:]):
+            commands = mp.Queue()
+            process = mp.Process(target=_worker, daemon=True,
+                                 args=(names, width, height, self.seed, (r0, r1), halo, barrier, commands, self.done))
+            process.start()
+            self.commands.append(commands)
+            self.processes.append(process)
+
+    def populate(self, num_plants, num_animals, num_fungi):
+        """Coloca las entidades iniciales (igual que ArrayWorld.populate)."""
+        self.view.populate(num_plants, num_animals, num_fungi)
+
+    def step(self, ticks):
+        """Avanza `ticks` ticks sin volver al proceso principal entre ellos."""
+        before = self.view._snapshot() if self.track_changes else None
+        for commands in self.commands:
+            commands.put((self.tick, ticks))
+        for _ in self.processes:
+            self.done.get()
+        self.tick += ticks
+        self.view.tick = self.tick
+        if before is not None:
+            self.changed = self.view._changed_since(before)
+
+    def update(self):
+        """Ejecuta un tick de la simulación en todas las franjas."""
+        self.step(1)
+
+    @property
+    def terrain(self):
+        """Capa de terreno compartida (la de la vista completa), como en ArrayWorld."""
+        return self.view.terrain
+
+    def get_grid_codes(self):
+        return self.view.get_grid_codes()
+
+    def get_grid_state(self):
+        return self.view.get_grid_state()
+
+    def get_cell_codes(self, cells):
+        return self.view.get_cell_codes(cells)
+
+    def population_counts(self):
+        return self.view.population_counts()
+
+    def close(self):
+        """Detiene los procesos y libera la memoria compartida."""
+        for commands in self.commands:
+            commands.put(None)
+        for process in self.processes:
+            process.join()
+        self.view = None
+        for segment in self.segments.values():
+            segment.close()
+            segment.unlink()
+        self.segments = {}
+
+
+def benchmark(width, height, ticks, worker_counts, seed=0, animals=None, fungi=None):
+    """Mide ticks por segundo para cada número de procesos; devuelve [(procesos, ticks/s)]."""
+    animals = animals if animals is not None else width * height // 20
+    fungi = fungi if fungi is not None else width * height // 100
+    results = []
+    for workers in worker_counts:
+        world = TiledWorld(width, height, seed=seed, workers=workers)
+        try:
+            world.populate(0, animals, fungi)
+            world.step(1)  # Calentamiento: arranque de procesos e importaciones
+            start = time.perf_counter()
+            world.step(ticks)
+            results.append((workers, ticks / (time.perf_counter() - start)))
+        finally:
+            world.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de escalado del mundo en franjas paralelas.")
+    parser.add_argument("--width", type=int, default=4096)
+    parser.add_argument("--height", type=int, default=4096)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="números de procesos a probar")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    worker_counts = args.workers or sorted({1, 2, 4, 8, mp.cpu_count()} & set(range(1, mp.cpu_count() + 1)))
+    results = benchmark(args.width, args.height, args.ticks, worker_counts, args.seed)
+    base = results[0][1]
+    print(f"Mundo {args.width}x{args.height}, {args.ticks} ticks")
+    print("procesos  ticks/s  aceleración")
+    for workers, rate in results:
+        print(f"{workers:8d} {rate:8.2f} {rate / base:11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#vector_world.py
+import argparse
+import time
+import numpy as np
+from world import CELL_LABELS
+from array_world import ArrayWorld, LAYERS, ETYPE_CODES, EMPTY, LIVE
+from rng import BatchStreams, new_seed
+
+
+class VectorWorld(ArrayWorld):
+    """Lote de `count` mundos de arrays independientes que avanzan juntos con una llamada por tick.
+
+    Las capas de ArrayWorld guardan todos los mundos seguidos (el mundo n ocupa las celdas
+    [n * area, (n + 1) * area)) y cada fase de reglas se aplica a todo el lote a la vez;
+    los vecindarios y movimientos no cruzan de un mundo a otro. Cada mundo tiene su semilla
+    y su tick, así que evoluciona exactamente igual que ArrayWorld(width, height, seed=seeds[n]).
+
+    Los mundos con `active[n] = False` quedan congelados; reset() los reinicia por separado.
+    """
+
+    def __init__(self, count, width=24, height=24, seeds=None, populations=(1, 1, 1), terrain="minimal", layers=None):
+        """`populations` son las plantas, animales y hongos iniciales de cada mundo;
+        con `layers` (arrays de count * width * height celdas) el lote se crea sin reiniciar los mundos.
+        """
+        self.count = count
+        self.area = width * height
+        self.seeds = list(seeds) if seeds is not None else [new_seed() for _ in range(count)]
+        if len(self.seeds) != count:
+            raise ValueError(f"Se esperaban {count} semillas y se recibieron {len(self.seeds)}")
+        fresh = layers is None
+        if fresh:
+            layers = {name: np.zeros(count * self.area, dtype=dtype) for name, dtype in LAYERS.items()}
+        super().__init__(width, height, seed=self.seeds[0], layers=layers)
+        self.rng = BatchStreams(self.seeds)
+        self.ticks = np.zeros(count, dtype=np.int64)  # Tick de cada mundo (vuelve a 0 al reiniciarlo)
+        self.active = np.ones(count, dtype=bool)  # Mundos que avanzan en update(); los demás no cambian
+        self.populations = tuple(populations)
+        self.terrain_kind = terrain
+        # Vistas sin copia de cada capa con forma (mundo, fila, columna)
+        self.views = {name: getattr(self, name).reshape(count, height, width) for name in LAYERS}
+        self._observation = np.zeros((count, height, width), dtype=np.uint8)
+        self._frozen = None  # (mundos, capas) de los mundos inactivos durante un tick
+
+        if fresh:
+            self.reset(seeds=self.seeds)
+
+    def save_checkpoint(self, path):
+        raise NotImplementedError("VectorWorld no guarda checkpoints: guarda cada mundo con ArrayWorld")
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        raise NotImplementedError("VectorWorld no carga checkpoints: cada uno contiene un solo ArrayWorld")
+
+    def fork(self, seeds=None):
+        """Copia el lote en memoria; con otras semillas (una por mundo) sigue continuaciones distintas."""
+        other = VectorWorld(self.count, self.width, self.height, seeds=self.seeds if seeds is None else seeds,
+                            populations=self.populations, terrain=self.terrain_kind,
+                            layers={name: getattr(self, name).copy() for name in LAYERS})
+        other.tick = self.tick
+        other.ticks = self.ticks.copy()
+        other.active = self.active.copy()
+        return other
+
+    def reset(self, worlds=None, seeds=None):
+        """Reinicia los mundos indicados (todos por defecto) con terreno y población nuevos y tick 0.
+
+        Sin `seeds`, cada mundo reiniciado recibe una semilla nueva al azar.
+        """
+        worlds = np.arange(self.count) if worlds is None else np.atleast_1d(worlds)
+        seeds = [new_seed() for _ in worlds] if seeds is None else list(seeds)
+        self.rng.seed(worlds, seeds)
+        for n, seed in zip(worlds.tolist(), seeds):
+            self.seeds[n] = seed
+            # Un ArrayWorld sobre las porciones del mundo n genera su terreno y su población en el sitio
+            cells = slice(n * self.area, (n + 1) * self.area)
+            layers = {name: getattr(self, name)[cells] for name in LAYERS}
+            for layer in layers.values():
+                layer[:] = 0
+            world = ArrayWorld(self.width, self.height, seed=seed, layers=layers)
+            world.generate_terrain(self.terrain_kind)
+            world.populate(*self.populations)
+        self.ticks[worlds] = 0
+        self.active[worlds] = True
+
+    def populate(self, num_plants, num_animals, num_fungi):
+        """Cambia la población inicial y reinicia todos los mundos con sus semillas actuales."""
+        self.populations = (num_plants, num_animals, num_fungi)
+        self.reset(seeds=self.seeds)
+
+    def _random(self, stream, cells, draw=0, fan=None):
+        """Sorteo por celda con la semilla y el tick del mundo de cada celda (misma clave local que ArrayWorld)."""
+        worlds, keys = np.divmod(cells, self.area)
+        if fan is not None:
+            keys = keys[:, None] * fan + np.arange(fan)
+            worlds = worlds[:, None]
+        return self.rng.random_array(stream, worlds, keys, draw)
+
+    def begin_tick(self):
+        self._before = self._snapshot() if self.track_changes else None
+        self.rng.begin_tick(self.ticks)
+        frozen = np.flatnonzero(~self.active)
+        self._frozen = (frozen, {name: view[frozen] for name, view in self.views.items()}) if frozen.size else None
+
+    def end_tick(self):
+        # Los mundos inactivos recuperan su estado: las reglas se aplican a todo el lote
+        if self._frozen is not None:
+            frozen, saved = self._frozen
+            for name, view in self.views.items():
+                view[frozen] = saved[name]
+            self._frozen = None
+        self.ticks[self.active] += 1
+        super().end_tick()
+
+    def observe(self):
+        """Códigos de celda (ver world.CELL_LABELS) de todos los mundos, forma (count, height, width).
+
+        Se escriben siempre en el mismo buffer: el resultado cambia en la siguiente llamada.
+        Para leer sin ninguna copia están las capas en `views`.
+        """
+        etype = self.views["etype"]
+        out = self._observation
+        np.take(ETYPE_CODES, etype, out=out)
+        out += self.views["state"]
+        np.copyto(out, self.views["terrain"], where=etype == EMPTY)
+        return out
+
+    def population_counts(self):
+        """Entidades vivas de cada tipo por mundo: array (count, 5) en el orden de world.POPULATION_KINDS."""
+        etype = self.etype.reshape(self.count, self.area)
+        live = self.state.reshape(self.count, self.area) == LIVE
+        return np.stack([((etype == kind) & live).sum(axis=1) for kind in range(1, len(ETYPE_CODES))], axis=1)
+
+    def extinct(self):
+        """Mundos sin ninguna entidad viva (máscara de longitud count)."""
+        return self.population_counts().sum(axis=1) == 0
+
+    def get_grid_state(self, world=0):
+        """Estado de la cuadrícula de un mundo del lote como una lista de listas."""
+        return [[CELL_LABELS[code] for code in row] for row in self.observe()[world].tolist()]
+
+
+def benchmark(count, width, height, ticks, seed=0, populations=(5, 10, 2)):
+    """Ticks de mundo por segundo del lote frente a un bucle de ArrayWorld; devuelve (lote, bucle)."""
+    seeds = list(range(seed, seed + count))
+    batch = VectorWorld(count, width, height, seeds=seeds, populations=populations)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        batch.update()
+    vector = count * ticks / (time.perf_counter() - start)
+
+    worlds = []
+    for s in seeds:
+        world = ArrayWorld(width, height, seed=s)
+        world.populate(*populations)
+        worlds.append(world)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for world in worlds:
+            world.update()
+    loop = count * ticks / (time.perf_counter() - start)
+    return vector, loop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de muchos mundos pequeños avanzados en lote.")
+    parser.add_argument("--count", type=int, default=1000, help="mundos del lote")
+    parser.add_argument("--width", type=int, default=16)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0, help="semilla del primer mundo (las demás son consecutivas)")
+    args = parser.parse_args(argv)
+
+    vector, loop = benchmark(args.count, args.width, args.height, args.ticks, args.seed)
+    print(f"{args.count} mundos de {args.width}x{args.height}: lote {vector:.0f} ticks de mundo/s, "
+          f"bucle de ArrayWorld {loop:.0f} ticks de mundo/s ({vector / loop:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
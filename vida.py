@@ -1,302 +1,77 @@
 #vida.py
-import pygame
-import random
-from animal import AnimalSmall, AnimalBig
-from plant import PlantLow, PlantHigh
-from fungi import Fungi
-from openpyxl import Workbook  # Para generar el archivo Excel
- 
-# Configuración de Pygame
-pygame.init()
-SCREEN_SIZE = (1024, 1024)  # Tamaño de la ventana
-CELL_SIZE = SCREEN_SIZE[0] // 24  # Tamaño de cada celda (24x24 grid)
-screen = pygame.display.set_mode(SCREEN_SIZE)
-clock = pygame.time.Clock()
-
-# Cargar imágenes
-fungi_img = pygame.image.load("fungi.png")
-animal_small_img = pygame.image.load("animal1.png")
-animal_big_img = pygame.image.load("animal2.png")
-plant_low_img = pygame.image.load("plant1.png")
-plant_high_img = pygame.image.load("plant2.png")
-skull_img = pygame.image.load("skull.png")  # Imagen para entidades muertas
-
-# Escalar imágenes al tamaño de las celdas
-fungi_img = pygame.transform.scale(fungi_img, (CELL_SIZE, CELL_SIZE))
-animal_small_img = pygame.transform.scale(animal_small_img, (CELL_SIZE, CELL_SIZE))
-animal_big_img = pygame.transform.scale(animal_big_img, (CELL_SIZE, CELL_SIZE))
-plant_low_img = pygame.transform.scale(plant_low_img, (CELL_SIZE, CELL_SIZE))
-plant_high_img = pygame.transform.scale(plant_high_img, (CELL_SIZE, CELL_SIZE))
-skull_img = pygame.transform.scale(skull_img, (CELL_SIZE, CELL_SIZE))
-
-# Colores para recursos (rock, soil, soil+, water)
-COLORS = {
-    "ground": (34, 139, 34),  # Verde para el suelo
-    "water": (0, 0, 255),  # Azul para agua
-    "rock": (128, 128, 128),  # Gris para rocas
-    "soil": (139, 69, 19),  # Marrón para tierra
-    "soil+": (210, 105, 30),  # Marrón oscuro para tierra fértil
-}
-
-class World:
-    def __init__(self, width=24, height=24):
-        self.width = width
-        self.height = height
-        self.grid = [[None for _ in range(width)] for _ in range(height)]
-        self.entities = []
-        self.resource_tiles = []  # Almacena casillas de recursos (rock, soil, soil+, water)
-
-        # Generar características mínimas iniciales
-        self.generate_initial_resources()
-
-    def generate_initial_resources(self):
-        """Genera al menos una casilla de cada tipo: rock, soil, soil+, water."""
-        # Generar una casilla de roca
-        x, y = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-        self.grid[y][x] = "rock"
-        self.resource_tiles.append(("rock", x, y))
-
-        # Generar una casilla de tierra
-        while True:
-            x, y = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-            if self.grid[y][x] is None:
-                self.grid[y][x] = "soil"
-                self.resource_tiles.append(("soil", x, y))
-                break
-
-        # Generar una casilla de tierra fértil (soil+)
-        while True:
-            x, y = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-            if self.grid[y][x] is None:
-                self.grid[y][x] = "soil+"
-                self.resource_tiles.append(("soil+", x, y))
-                break
-
-        # Generar una casilla de agua
-        while True:
-            x, y = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-            if self.grid[y][x] is None:
-                self.grid[y][x] = "water"
-                self.resource_tiles.append(("water", x, y))
-                break
-
-    def add_entity(self, entity):
-        """Añade una entidad a la simulación si la celda está vacía."""
-        if 0 <= entity.x < self.width and 0 <= entity.y < self.height and self.grid[entity.y][entity.x] is None:
-            self.grid[entity.y][entity.x] = entity
-            self.entities.append(entity)
-
-    def update(self):
-        """Ejecuta un tick de la simulación."""
-        for entity in list(self.entities):
-            if entity.state == 'remove':
-                self.remove_entity(entity)
-                continue
-
-            if entity.state == 'dead':
-                continue  # Entidades muertas no hacen nada
-
-            if isinstance(entity, (AnimalSmall, AnimalBig)):
-                entity.move(self.grid)
-                entity.consume_plant(self.grid)
-                entity.check_death()
-                entity.check_reproduction(self.grid)
-            elif isinstance(entity, (PlantLow, PlantHigh)):
-                entity.grow(self.grid)
-                entity.check_death()
-            elif isinstance(entity, Fungi):
-                entity.grow(self.grid)
-                entity.check_death()
-
-        # Generar hongos en cadáveres
-        for x in range(self.width):
-            for y in range(self.height):
-                cell = self.grid[y][x]
-                if hasattr(cell, 'state') and cell.state == 'dead' and random.random() < 0.1:
-                    self.add_entity(Fungi(x, y))
-
-    def remove_entity(self, entity):
-        """Elimina una entidad de la simulación."""
-        if entity in self.entities:
-            self.entities.remove(entity)
-        if self.grid[entity.y][entity.x] == entity:
-            self.grid[entity.y][entity.x] = None
-
-    def display(self):
-        """Dibuja el mundo en la ventana de Pygame."""
-        screen.fill(COLORS["ground"])  # Fondo verde (suelo)
-
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self.grid[y][x]
-                if cell == "rock":
-                    color = COLORS["rock"]
-                    pygame.draw.rect(screen, color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                elif cell == "soil":
-                    color = COLORS["soil"]
-                    pygame.draw.rect(screen, color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                elif cell == "soil+":
-                    color = COLORS["soil+"]
-                    pygame.draw.rect(screen, color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                elif cell == "water":
-                    color = COLORS["water"]
-                    pygame.draw.rect(screen, color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                elif isinstance(cell, PlantLow) and cell.state != 'remove':
-                    if cell.state == 'dead':
-                        screen.blit(skull_img, (x * CELL_SIZE, y * CELL_SIZE))
-                    else:
-                        screen.blit(plant_low_img, (x * CELL_SIZE, y * CELL_SIZE))
-                elif isinstance(cell, PlantHigh) and cell.state != 'remove':
-                    if cell.state == 'dead':
-                        screen.blit(skull_img, (x * CELL_SIZE, y * CELL_SIZE))
-                    else:
-                        screen.blit(plant_high_img, (x * CELL_SIZE, y * CELL_SIZE))
-                elif isinstance(cell, AnimalSmall) and cell.state != 'remove':
-                    if cell.state == 'dead':
-                        screen.blit(skull_img, (x * CELL_SIZE, y * CELL_SIZE))
-                    else:
-                        screen.blit(animal_small_img, (x * CELL_SIZE, y * CELL_SIZE))
-                elif isinstance(cell, AnimalBig) and cell.state != 'remove':
-                    if cell.state == 'dead':
-                        screen.blit(skull_img, (x * CELL_SIZE, y * CELL_SIZE))
-                    else:
-                        screen.blit(animal_big_img, (x * CELL_SIZE, y * CELL_SIZE))
-                elif isinstance(cell, Fungi) and cell.state != 'remove':
-                    if cell.state == 'dead':
-                        screen.blit(skull_img, (x * CELL_SIZE, y * CELL_SIZE))
-                    else:
-                        screen.blit(fungi_img, (x * CELL_SIZE, y * CELL_SIZE))
-
-        pygame.display.update()  # Actualizar la pantalla
-
-    def get_grid_state(self):
-        """Devuelve el estado actual de la cuadrícula como una lista de listas."""
-        grid_state = []
-        for y in range(self.height):
-            row = []
-            for x in range(self.width):
-                cell = self.grid[y][x]
-                if cell == "rock":
-                    row.append("rock")
-                elif cell == "soil":
-                    row.append("soil")
-                elif cell == "soil+":
-                    row.append("soil+")
-                elif cell == "water":
-                    row.append("water")
-                elif isinstance(cell, PlantLow):
-                    row.append("PlantLow" if cell.state == 'live' else "PlantLow (dead)")
-                elif isinstance(cell, PlantHigh):
-                    row.append("PlantHigh" if cell.state == 'live' else "PlantHigh (dead)")
-                elif isinstance(cell, AnimalSmall):
-                    row.append("AnimalSmall" if cell.state == 'live' else "AnimalSmall (dead)")
-                elif isinstance(cell, AnimalBig):
-                    row.append("AnimalBig" if cell.state == 'live' else "AnimalBig (dead)")
-                elif isinstance(cell, Fungi):
-                    row.append("Fungi" if cell.state == 'live' else "Fungi (dead)")
-                else:
-                    row.append("empty")
-            grid_state.append(row)
-        return grid_state
-
-# Función para que el usuario elija el número de ticks
-def get_user_ticks():
-    while True:
-        ticks = input("Ingresa el número de ticks para la simulación (por ejemplo, 50): ")
-        try:
-            ticks = int(ticks)
-            if ticks > 0:
-                return ticks
-            else:
-                print("Por favor, ingresa un número mayor que 0.")
-        except ValueError:
-            print("Entrada inválida. Intenta nuevamente.")
-
-# Función para que el usuario elija el número de entidades iniciales
-def get_user_entities():
-    while True:
-        try:
-            num_plants = int(input("Ingresa el número inicial de plantas (1-3): "))
-            num_animals = int(input("Ingresa el número inicial de animales (1-3): "))
-            num_fungi = int(input("Ingresa el número inicial de hongos (1-3): "))
-
-            if 1 <= num_plants <= 3 and 1 <= num_animals <= 3 and 1 <= num_fungi <= 3:
-                return num_plants, num_animals, num_fungi
-            else:
-                print("Por favor, ingresa un número entre 1 y 3 para cada tipo de entidad.")
-        except ValueError:
-            print("Entrada inválida. Intenta nuevamente.")
-
-# 🌍 **Inicialización del Mundo**
-world = World(24, 24)
-
-# 🎬 **Elección de Ticks y Entidades por Consola**
-ticks = get_user_ticks()  # El usuario elige el número de ticks
-num_plants, num_animals, num_fungi = get_user_entities()  # El usuario elige el número de entidades
-
-# Generar entidades iniciales
-for _ in range(num_plants):
-    while True:
-        x, y = random.randint(0, 23), random.randint(0, 23)
-        if world.grid[y][x] == "soil" or world.grid[y][x] == "soil+":
-            world.add_entity(PlantLow(x, y))
-            break
-
-for _ in range(num_animals):
-    while True:
-        x, y = random.randint(0, 23), random.randint(0, 23)
-        if world.grid[y][x] is None:
-            world.add_entity(AnimalSmall(x, y))
-            break
-
-for _ in range(num_fungi):
-    while True:
-        x, y = random.randint(0, 23), random.randint(0, 23)
-        if world.grid[y][x] is None:
-            world.add_entity(Fungi(x, y))
-            break
-
-# Crear un archivo Excel para guardar el resumen
-workbook = Workbook()
-sheet = workbook.active
-sheet.title = "Tick 0"  # Hoja inicial
-
-# Guardar el estado inicial de la cuadrícula
-grid_state = world.get_grid_state()
-for y in range(24):
-    for x in range(24):
-        sheet.cell(row=y + 1, column=x + 1, value=grid_state[y][x])
-
-current_tick = 0
-
-# 🎬 **Bucle Principal de Pygame**
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Actualizar y dibujar el mundo
-    if current_tick < ticks:
-        world.update()
-        world.display()
-        current_tick += 1
-
-        # Guardar el estado de la cuadrícula en una nueva hoja
-        sheet = workbook.create_sheet(title=f"Tick {current_tick}")
-        grid_state = world.get_grid_state()
-        for y in range(24):
-            for x in range(24):
-                sheet.cell(row=y + 1, column=x + 1, value=grid_state[y][x])
-    else:
-        running = False  # Detener la simulación después de los ticks especificados
-
-    # Controlar la velocidad de la simulación
-    clock.tick(1)  # 1 tick por segundo
-
-# Guardar el archivo Excel
-workbook.save("simulation_summary.xlsx")
-print("Resumen de la simulación guardado en 'simulation_summary.xlsx'.")
-
-# Finalizar la simulación y cerrar Pygame
-pygame.quit()
\ No newline at end of file
+import argparse
+from world import World
+from event_world import EventWorld
+
+
+def parse_args(argv=None):
+    """Lee los parámetros de la simulación desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulación de vida (animales, plantas y hongos).")
+    parser.add_argument("--ticks", type=int, default=50, help="número de ticks a simular")
+    parser.add_argument("--width", type=int, default=24, help="ancho de la cuadrícula")
+    parser.add_argument("--height", type=int, default=24, help="alto de la cuadrícula")
+    parser.add_argument("--plants", type=int, default=1, help="plantas iniciales")
+    parser.add_argument("--animals", type=int, default=1, help="animales iniciales")
+    parser.add_argument("--fungi", type=int, default=1, help="hongos iniciales")
+    parser.add_argument("--seed", type=int, default=None, help="semilla del generador aleatorio")
+    parser.add_argument("--engine", choices=["world", "event"], default="world",
+                        help="motor: World procesa todas las entidades en cada tick, EventWorld sólo las que tienen eventos")
+    parser.add_argument("--terrain", choices=["minimal", "procedural"], default="minimal",
+                        help="terreno inicial: una casilla de cada recurso o generado por ruido (mapas grandes)")
+    parser.add_argument("--render", action="store_true", help="mostrar la simulación en una ventana de Pygame")
+    parser.add_argument("--fps", type=float, default=30, help="frames por segundo como máximo al renderizar")
+    parser.add_argument("--tps", type=float, default=None, help="ticks por segundo como máximo (sin límite por defecto)")
+    parser.add_argument("--record", default=None, help="grabar cada tick en este archivo (.vida)")
+    parser.add_argument("--compression", choices=["none", "zlib", "zstd"], default="zlib",
+                        help="compresión de la grabación")
+    parser.add_argument("--keyframe-interval", type=int, default=64, help="ticks entre keyframes de la grabación")
+    parser.add_argument("--stats", default=None, help="escribir poblaciones y eventos por tipo en este CSV")
+    parser.add_argument("--stats-stride", type=int, default=1, help="ticks entre filas de --stats")
+    parser.add_argument("--profile", action="store_true", help="medir fases, tipos y observadores y resumir al salir")
+    parser.add_argument("--metrics", default=None, help="exportar las métricas de cada tick a este archivo (activa --profile)")
+    parser.add_argument("--metrics-format", choices=["jsonl", "prometheus"], default="jsonl",
+                        help="formato de --metrics: líneas JSON o archivo de texto de Prometheus")
+    args = parser.parse_args(argv)
+
+    if args.ticks <= 0:
+        parser.error("--ticks debe ser mayor que 0")
+    if args.width < 2 or args.height < 2:
+        parser.error("la cuadrícula debe ser de al menos 2x2")
+    if not 1 <= args.keyframe_interval <= 0xFFFF:  # recorder.MAX_KEYFRAME_INTERVAL (uint16 en la cabecera)
+        parser.error("--keyframe-interval debe estar entre 1 y 65535")
+    if args.stats_stride <= 0:
+        parser.error("--stats-stride debe ser mayor que 0")
+    if min(args.plants, args.animals, args.fungi) < 0:
+        parser.error("las poblaciones iniciales no pueden ser negativas")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 🌍 **Inicialización del Mundo**
+    engine = EventWorld if args.engine == "event" else World
+    world = engine(args.width, args.height, seed=args.seed, terrain=args.terrain)
+    world.populate(args.plants, args.animals, args.fungi)
+
+    # Observadores opcionales: se importan sólo si se piden
+    if args.profile or args.metrics:
+        from metrics import Metrics
+        Metrics(args.metrics, args.metrics_format).attach(world)
+    if args.render:
+        from render import PygameRenderer
+        world.attach(PygameRenderer(world, fps=args.fps, tps=args.tps))
+    if args.stats:
+        from stats import StatsWriter
+        world.attach(StatsWriter(args.stats, args.stats_stride))
+    if args.record:
+        from recorder import Recorder
+        world.attach(Recorder(args.record, args.keyframe_interval, args.compression))
+
+    # 🎬 **Bucle Principal**
+    world.run(args.ticks)
+    print(f"Simulación terminada tras {world.tick} ticks.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#websocket.py
+import base64
+import hashlib
+import os
+import struct
+
+# Lo mínimo del protocolo WebSocket (RFC 6455) sobre streams de asyncio: apertura HTTP
+# y tramas sin fragmentar. Suficiente para server.py y loadtest.py sin dependencias.
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+TEXT, BINARY, CLOSE, PING, PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+MAX_PAYLOAD = 1 << 16  # Tamaño máximo de los mensajes que el servidor acepta de un cliente
+
+
+def accept_key(key):
+    """Valor de Sec-WebSocket-Accept para la clave del cliente."""
+    return base64.b64encode(hashlib.sha1(key.encode() + GUID).digest()).decode()
+
+
+async def _read_head(reader):
+    """Lee una cabecera HTTP; devuelve (primera línea, cabeceras en minúsculas)."""
+    lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def server_handshake(reader, writer):
+    """Acepta la apertura de un cliente y devuelve la ruta pedida (p. ej. /session/a?width=64)."""
+    request, headers = await _read_head(reader)
+    parts = request.split(" ")
+    key = headers.get("sec-websocket-key")
+    if len(parts) != 3 or parts[0] != "GET" or headers.get("upgrade", "").lower() != "websocket" or not key:
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        raise ValueError(f"Apertura WebSocket no válida: {request!r}")
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode())
+    return parts[1]
+
+
+async def client_handshake(reader, writer, host, path):
+    """Abre la conexión WebSocket desde el lado del cliente."""
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    status, headers = await _read_head(reader)
+    if " 101 " not in status or headers.get("sec-websocket-accept") != accept_key(key):
+        raise ValueError(f"El servidor rechazó la conexión: {status!r}")
+
+
+def _mask(data, key):
+    """Aplica (o quita) la máscara XOR de 4 bytes de las tramas del cliente."""
+    n = len(data)
+    stream = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")).to_bytes(n, "little")
+
+
+def encode_frame(opcode, payload=b"", mask=False):
+    """Trama completa (FIN) con el opcode y los datos; los clientes deben enmascarar."""
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        header = struct.pack(">BB", 0x80 | opcode, bit | n)
+    elif n < 1 << 16:
+        header = struct.pack(">BBH", 0x80 | opcode, bit | 126, n)
+    else:
+        header = struct.pack(">BBQ", 0x80 | opcode, bit | 127, n)
+    if mask:
+        key = os.urandom(4)
+        return header + key + _mask(payload, key)
+    return header + payload
+
+
+async def read_frame(reader, max_size=MAX_PAYLOAD):
+    """Lee una trama y devuelve (opcode, datos sin máscara); max_size=None no limita el tamaño."""
+    first, second = await reader.readexactly(2)
+    n = second & 0x7F
+    if n == 126:
+        n, = struct.unpack(">H", await reader.readexactly(2))
+    elif n == 127:
+        n, = struct.unpack(">Q", await reader.readexactly(8))
+    if max_size is not None and n > max_size:
+        raise ValueError(f"Trama demasiado grande: {n} bytes")
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(n)
+    return first & 0x0F, _mask(payload, key) if key else payload
@@ -0,0 +1,502 @@
+#world.py
+from math import log
+from time import perf_counter
+from animal import AnimalSmall, AnimalBig
+from plant import PlantLow, PlantHigh
+from fungi import Fungi
+from indexes import GridIndex, CellSet, kind_of
+from registry import EntityStore, EntityPool
+from stats import PopulationStats
+from scheduler import TimingWheel
+from entity import Kind, LIVE, DEAD, REMOVE, clone
+from rng import RandomStreams, new_seed, TERRAIN, POPULATE, SPAWN
+from terrain import ROCK, SOIL, SOIL_PLUS, WATER, DEGRADE, ENRICH
+
+# Códigos enteros de cada celda para grabaciones y exportaciones compactas (0-4: terreno, ver terrain.py)
+CELL_LABELS = [
+    "empty", "rock", "soil", "soil+", "water",
+    "PlantLow", "PlantLow (dead)", "PlantHigh", "PlantHigh (dead)",
+    "AnimalSmall", "AnimalSmall (dead)", "AnimalBig", "AnimalBig (dead)",
+    "Fungi", "Fungi (dead)",
+]
+SOIL_CODES = (SOIL, SOIL_PLUS)  # Terreno donde crecen las plantas
+# Código de la entidad viva; el mismo código + 1 indica la entidad muerta
+ENTITY_CODES = {PlantLow: 5, PlantHigh: 7, AnimalSmall: 9, AnimalBig: 11, Fungi: 13}
+# Orden de los contadores de población (mismo orden que entity.Kind)
+POPULATION_KINDS = ("PlantLow", "PlantHigh", "AnimalSmall", "AnimalBig", "Fungi")
+POPULATION_CLASSES = (PlantLow, PlantHigh, AnimalSmall, AnimalBig, Fungi)
+SPAWN_CHANCE = 0.1  # Probabilidad por tick de que aparezca un hongo sobre un cadáver
+
+
+class Engine:
+    """Base común de los motores: bucle de ticks y observadores (render, grabación...)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.tick = 0  # Número de ticks ejecutados
+        self.observers = []  # Observadores notificados tras cada tick
+        self.track_changes = False  # Lo activan los observadores que necesitan `changed`
+        self.changed = set()  # Índices (y * width + x) de las celdas que cambiaron en el último tick
+        self.phases = []  # (nombre, método) de cada fase de un tick, en orden de ejecución
+        self.phase_times = None  # {fase: segundos acumulados} si se miden las fases (ver bench.py)
+        self.metrics = None  # metrics.Metrics si la simulación está instrumentada
+
+    def attach(self, observer):
+        """Registra un observador; recibe on_tick(world) tras cada tick y close() al terminar."""
+        self.observers.append(observer)
+
+    def run(self, ticks):
+        """Ejecuta `ticks` ticks sin pausas; se detiene antes si un observador devuelve False."""
+        for observer in self.observers:
+            observer.on_tick(self)  # Estado inicial (tick 0)
+
+        for _ in range(ticks):
+            self.update()
+            if not self.notify():
+                break
+
+        for observer in self.observers:
+            observer.close()
+        if self.metrics is not None:
+            self.metrics.close()
+
+    def notify(self):
+        """Llama a on_tick de cada observador (y cierra el tick de las métricas); False si alguno pide detenerse."""
+        keep_running = True
+        metrics = self.metrics
+        for observer in self.observers:
+            if metrics is None:
+                result = observer.on_tick(self)
+            else:
+                start = perf_counter()
+                result = observer.on_tick(self)
+                name = type(observer).__name__
+                self.phase_times[name] = self.phase_times.get(name, 0.0) + perf_counter() - start
+            if result is False:
+                keep_running = False
+        if metrics is not None:
+            metrics.end_tick(self)
+        return keep_running
+
+    def update(self):
+        """Ejecuta un tick de la simulación, fase por fase."""
+        self.begin_tick()
+        times = self.phase_times
+        if times is None:
+            for _, phase in self.phases:
+                phase()
+        else:
+            for name, phase in self.phases:
+                start = perf_counter()
+                phase()
+                times[name] = times.get(name, 0.0) + perf_counter() - start
+        self.end_tick()
+
+    def begin_tick(self):
+        """Preparación antes de las fases del tick."""
+
+    def end_tick(self):
+        """Cierre tras las fases del tick."""
+        self.tick += 1
+
+    def get_grid_codes(self):
+        raise NotImplementedError
+
+    def get_cell_codes(self, cells):
+        """Códigos (ver CELL_LABELS) de las celdas indicadas por índice."""
+        raise NotImplementedError
+
+    def population_counts(self):
+        """Entidades vivas de cada tipo, en el orden de POPULATION_KINDS."""
+        raise NotImplementedError
+
+
+class World(Engine):
+    def __init__(self, width=24, height=24, seed=None, generate=True, terrain="minimal"):
+        super().__init__(width, height)
+        self.seed = new_seed() if seed is None else seed
+        self.rng = RandomStreams(self.seed)  # Todos los sorteos de la simulación salen de aquí
+        self.grid = [[None for _ in range(width)] for _ in range(height)]
+        self.entities = EntityStore()  # Todas las entidades que ejecutan ticks
+        self.pool = EntityPool()  # Objetos de entidades eliminadas, para reutilizar
+        self.terrain = bytearray(width * height)  # Capa de terreno (códigos de terrain.py), bajo las entidades
+        self.soil_changes = []  # Transiciones (celda, tabla) del ciclo de tierra pendientes en este tick
+        self.index = GridIndex(width, height)  # Tipo de cada celda y recuentos de vecinos
+        self.stats = PopulationStats()  # Poblaciones y eventos por tipo, al día en cada evento
+        # Celdas libres para sorteos en O(1): sin entidad ni roca, y de tierra (soil/soil+) sin entidad
+        self.empty_cells = CellSet(width * height, full=True)
+        self.free_soil = CellSet(width * height)
+        # Id de cada cadáver por tick en que aparecerá un hongo sobre él (espera geométrica sorteada al exponerse)
+        self.spawn_wheel = TimingWheel()
+        self.phases = [("movement", self._move_animals), ("entities", self._update_entities),
+                       ("soil_cycle", self._apply_soil_cycle), ("spawn_fungi", self._spawn_fungi)]
+
+        # Generar el terreno inicial (no al restaurar un checkpoint o una copia)
+        if generate:
+            self.generate_terrain(terrain)
+
+    def save_checkpoint(self, path):
+        """Guarda el estado completo del mundo en un archivo binario (ver checkpoint.py)."""
+        from checkpoint import save_world
+        save_world(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Reconstruye un mundo guardado con save_checkpoint."""
+        from checkpoint import load_world
+        return load_world(path)
+
+    def fork(self, seed=None):
+        """Copia el mundo en memoria para continuarlo por separado.
+
+        Con la misma semilla la copia repite exactamente el futuro del original;
+        con otra semilla sigue una continuación distinta desde el mismo estado.
+        """
+        other = type(self)(self.width, self.height, seed=self.seed if seed is None else seed, generate=False)
+        other.tick = self.tick
+        other.grid = [row[:] for row in self.grid]
+        other.terrain = bytearray(self.terrain)
+        other.index = self.index.copy()
+        other.stats = self.stats.copy()
+        other.empty_cells = self.empty_cells.copy()
+        other.free_soil = self.free_soil.copy()
+        other.spawn_wheel = self.spawn_wheel.copy()
+
+        store = other.entities
+        store.generations = list(self.entities.generations)
+        store.free = list(self.entities.free)
+        store.slots = [None] * len(self.entities.slots)
+        for entity in self.entities.dense:
+            copy = clone(entity)
+            store.restore(copy, entity.id)
+            other.grid[copy.y][copy.x] = copy
+        return other
+
+    def random_free_cell(self, cells, stream, key, draw=0):
+        """Celda (x, y) al azar de un CellSet (p. ej. empty_cells), o None si no queda ninguna."""
+        i = cells.sample(self.rng, stream, key, draw)
+        return None if i is None else (i % self.width, i // self.width)
+
+    def generate_terrain(self, kind="minimal"):
+        """Genera el terreno inicial: "minimal" o "procedural" (ver terrain.procedural, requiere NumPy)."""
+        if kind == "procedural":
+            from terrain import procedural
+            self.reset_terrain(procedural(self.width, self.height, self.rng).tobytes())
+        elif kind == "minimal":
+            self.generate_initial_resources()
+        else:
+            raise ValueError(f"Terreno desconocido: {kind}")
+
+    def generate_initial_resources(self):
+        """Genera una casilla de cada tipo (rock, soil, soil+, water) en celdas distintas."""
+        candidates = self.empty_cells.copy()  # Celdas que aún no tienen recurso
+        for key, code in enumerate((ROCK, SOIL, SOIL_PLUS, WATER)):
+            i = candidates.sample(self.rng, TERRAIN, key)
+            if i is None:
+                break  # Cuadrícula llena
+            candidates.discard(i)
+            self.set_terrain(i, code)
+
+    def reset_terrain(self, codes):
+        """Sustituye toda la capa de terreno (p. ej. procedural) y recalcula las celdas libres."""
+        self.terrain[:] = codes
+        grid, width, terrain = self.grid, self.width, self.terrain
+        empty = [i for i in range(width * self.height) if terrain[i] != ROCK and grid[i // width][i % width] is None]
+        self.empty_cells.reset(empty)
+        self.free_soil.reset(i for i in empty if terrain[i] in SOIL_CODES)
+
+    def populate(self, num_plants, num_animals, num_fungi):
+        """Coloca las entidades iniciales en celdas libres al azar (plantas en tierra); se detiene si no quedan."""
+        key = 0  # Clave de cada sorteo de celda
+        for cls, count, cells in ((PlantLow, num_plants, self.free_soil), (AnimalSmall, num_animals, self.empty_cells),
+                                  (Fungi, num_fungi, self.empty_cells)):
+            for _ in range(count):
+                cell = self.random_free_cell(cells, POPULATE, key)
+                key += 1
+                if cell is None:
+                    break
+                self.spawn(cls(*cell))
+
+    def add_entity(self, entity):
+        """Añade una entidad a la simulación si la celda está vacía y no es roca."""
+        if 0 <= entity.x < self.width and 0 <= entity.y < self.height and \
+                entity.y * self.width + entity.x in self.empty_cells:
+            self.set_cell(entity.x, entity.y, entity)
+            self.entities.add(entity)
+            self.stats.added(entity)
+            if self.metrics is not None:
+                self.metrics.count("spawns")
+            if entity.state != LIVE:
+                self._schedule_corpse(entity)
+
+    def create(self, cls, *args, **kwargs):
+        """Crea una entidad de `cls` reutilizando memoria del pool (no la coloca)."""
+        return self.pool.create(cls, *args, **kwargs)
+
+    def spawn(self, entity):
+        """Coloca una entidad nueva en su celda (sustituyendo lo que hubiera) y la registra."""
+        old = self.grid[entity.y][entity.x]
+        if old is not None:
+            self.remove_entity(old)
+        self.set_cell(entity.x, entity.y, entity)
+        self.entities.add(entity)
+        self.stats.added(entity)
+        if self.metrics is not None:
+            self.metrics.count("spawns")
+        if entity.state != LIVE:
+            self._schedule_corpse(entity)
+
+    def transform(self, entity, cls):
+        """Convierte una entidad en otra clase de su familia en el mismo objeto (p. ej. PlantLow -> PlantHigh)."""
+        if entity.state == LIVE:
+            self.stats.promoted(entity.kind, cls.kind)
+        self.entities.retype(entity, cls)
+        self.refresh(entity)
+
+    def set_cell(self, x, y, value):
+        """Escribe una entidad (o None) en la cuadrícula manteniendo los índices al día."""
+        i = y * self.width + x
+        self.grid[y][x] = value
+        if value is None:
+            code = self.terrain[i]
+            if code != ROCK:
+                self.empty_cells.add(i)
+            if code in SOIL_CODES:
+                self.free_soil.add(i)
+        else:
+            self.empty_cells.discard(i)
+            self.free_soil.discard(i)
+        self.index.set(x, y, kind_of(value))
+        self.changed.add(i)
+
+    def set_terrain(self, i, code):
+        """Cambia el terreno de la celda i manteniendo las celdas libres al día."""
+        self.terrain[i] = code
+        if self.grid[i // self.width][i % self.width] is None:
+            if code == ROCK:
+                self.empty_cells.discard(i)
+            else:
+                self.empty_cells.add(i)
+            if code in SOIL_CODES:
+                self.free_soil.add(i)
+            else:
+                self.free_soil.discard(i)
+        self.changed.add(i)
+
+    def path_target(self, x, y, dx, dy, distance):
+        """Celda (índice) a `distance` pasos de (x, y) en la dirección (dx, dy) si un animal puede llegar, o None.
+
+        Cortan el camino el borde, la roca, entrar o salir del agua y las PlantHigh vivas;
+        las PlantLow, los hongos y los cadáveres se atraviesan. El destino debe estar vacío.
+        """
+        water = self.terrain[y * self.width + x] == WATER
+        for step in range(1, distance + 1):
+            nx, ny = x + dx * step, y + dy * step
+            if not (0 <= nx < self.width and 0 <= ny < self.height):
+                return None
+            code = self.terrain[ny * self.width + nx]
+            if code == ROCK or (code == WATER) != water:
+                return None
+            cell = self.grid[ny][nx]
+            if cell is not None and cell.kind == Kind.PLANT_HIGH and cell.state == LIVE:
+                return None
+        return ny * self.width + nx if cell is None else None
+
+    def enrich(self, x, y):
+        """Un hongo eliminó un cadáver en (x, y): la tierra se enriquece al final de la fase de entidades."""
+        self.soil_changes.append((y * self.width + x, ENRICH))
+
+    def consume(self, food, amount):
+        """Un animal come `amount` hp (energía en las plantas) de `food`: sin hp la planta muere y el hongo desaparece."""
+        if food.kind == Kind.FUNGI:
+            food.hp -= amount
+            food.check_death(self)
+        else:
+            food.energy -= amount
+            if food.energy <= 0:
+                food.state = DEAD
+                self.refresh(food)
+
+    def clear_corpse(self, fungus):
+        """El hongo elimina el cadáver que tiene debajo y la celda se enriquece."""
+        self.stats.cleared(fungus.corpse)
+        fungus.corpse = Kind.EMPTY
+        self.enrich(fungus.x, fungus.y)
+
+    def remove_fungus(self, fungus):
+        """Un hongo sin hp desaparece; el cadáver que tuviera debajo vuelve a quedar expuesto."""
+        x, y, corpse = fungus.x, fungus.y, fungus.corpse
+        self.remove_entity(fungus)
+        fungus.state = REMOVE  # Si aún no ha hecho su tick en este recorrido, ya no actúa
+        if self.metrics is not None:
+            self.metrics.count("deaths")
+        if corpse != Kind.EMPTY:
+            dead = self.create(POPULATION_CLASSES[corpse - 1], x, y)
+            dead.state = DEAD
+            self.spawn(dead)
+
+    def _schedule_corpse(self, entity):
+        """Programa el tick en que aparecerá un hongo sobre un cadáver: SPAWN_CHANCE por tick, espera geométrica."""
+        u = self.rng.random(SPAWN, entity.id)
+        wheel = self.spawn_wheel
+        wheel.schedule(wheel.tick + int(log(1.0 - u) / log(1.0 - SPAWN_CHANCE)), entity.id)
+
+    def _bury(self, corpse):
+        """Aparece un hongo sobre un cadáver, que queda debajo (Fungi.corpse) hasta que el hongo lo elimine."""
+        x, y, kind = corpse.x, corpse.y, corpse.kind
+        if self.entities.remove(corpse):
+            self.stats.buried(kind)
+            self.pool.release(corpse)
+        self.set_cell(x, y, None)
+        self.spawn(self.create(Fungi, x, y, corpse=kind))
+
+    def refresh(self, entity):
+        """Actualiza los índices y contadores tras un cambio de estado de la entidad (p. ej. al morir)."""
+        if self.grid[entity.y][entity.x] is not entity:
+            return
+        kind = kind_of(entity)
+        if kind == "dead" and self.index.cell_kind[entity.y * self.width + entity.x] != "dead":
+            self.stats.died(entity.kind)
+            if self.metrics is not None:
+                self.metrics.count("deaths")
+            if entity.kind == Kind.PLANT_HIGH:  # Ciclo de tierra: una PlantHigh muerta degrada la celda
+                self.soil_changes.append((entity.y * self.width + entity.x, DEGRADE))
+            self._schedule_corpse(entity)
+        if self.index.set(entity.x, entity.y, kind):
+            self.changed.add(entity.y * self.width + entity.x)
+
+    def begin_tick(self):
+        self.rng.begin_tick(self.tick)
+        self.changed = set()
+
+    def _animals(self):
+        """Animales que proponen un movimiento en este tick."""
+        return self.entities.of_type(AnimalSmall) + self.entities.of_type(AnimalBig)
+
+    def _move_animals(self):
+        """Movimiento en dos fases: cada animal propone un destino y después se resuelven los conflictos.
+
+        Las propuestas se calculan sobre la cuadrícula del inicio de la fase, así que el resultado
+        no depende del orden de las entidades: si varios animales eligen la misma celda, la ocupa
+        el que sale de la celda de menor índice (como en ArrayWorld).
+        """
+        width = self.width
+        proposals = []
+        for animal in self._animals():
+            target = animal.propose_move(self)
+            if target is not None:
+                proposals.append((target, animal.y * width + animal.x, animal))
+        proposals.sort(key=lambda proposal: proposal[:2])
+
+        moves = []
+        for target, _, animal in proposals:
+            if not moves or moves[-1][0] != target:
+                moves.append((target, animal))
+        # Los destinos estaban vacíos: vaciar primero todos los orígenes y después ocupar los destinos
+        for _, animal in moves:
+            self.set_cell(animal.x, animal.y, None)
+        for target, animal in moves:
+            animal.x, animal.y = target % width, target // width
+            self.set_cell(animal.x, animal.y, animal)
+
+    def _update_entities(self):
+        """Ejecuta el tick de cada entidad registrada."""
+        if self.metrics is not None:
+            self._update_entities_measured(self.metrics)
+            return
+        for entity in list(self.entities):
+            self._update_entity(entity)
+
+    def _update_entities_measured(self, metrics):
+        """Como _update_entities, midiendo tiempo y entidades procesadas por tipo."""
+        types = metrics.types
+        processed = metrics.entities
+        for entity in list(self.entities):
+            name = entity.__class__.__name__  # Antes del tick: puede transformarse
+            start = perf_counter()
+            self._update_entity(entity)
+            types[name] = types.get(name, 0.0) + perf_counter() - start
+            processed[name] = processed.get(name, 0) + 1
+
+    def _update_entity(self, entity):
+        """Tick de una entidad: la elimina si estaba marcada o ejecuta sus acciones si vive."""
+        if entity.state == REMOVE:
+            self.remove_entity(entity)
+            return
+
+        if entity.state == DEAD:
+            return  # Entidades muertas no hacen nada
+
+        if isinstance(entity, (AnimalSmall, AnimalBig)):
+            entity.act(self)  # Incluye el consumo al final del movimiento
+            entity.check_death(self)
+            entity.check_reproduction(self)
+        elif isinstance(entity, (PlantLow, PlantHigh)):
+            entity.grow(self)
+            entity.check_death(self)
+        elif isinstance(entity, Fungi):
+            entity.grow(self)
+            entity.check_death(self)
+        self.refresh(entity)
+
+    def _apply_soil_cycle(self):
+        """Aplica en bloque las transiciones del ciclo de tierra acumuladas durante el tick, en orden."""
+        terrain = self.terrain
+        for i, table in self.soil_changes:
+            code = table[terrain[i]]
+            if code != terrain[i]:
+                self.set_terrain(i, code)
+        self.soil_changes = []
+
+    def _spawn_fungi(self):
+        """Hace aparecer los hongos programados para este tick sobre sus cadáveres (sólo se visitan esos)."""
+        due = self.spawn_wheel.advance()
+        if self.metrics is not None:
+            self.metrics.count("cells_scanned", len(due))
+        for corpse_id in due:
+            corpse = self.entities.get(corpse_id)
+            if corpse is not None and corpse.state == DEAD:
+                self._bury(corpse)
+
+    def end_tick(self):
+        self.pool.flush()
+        self.tick += 1
+
+    def remove_entity(self, entity):
+        """Elimina una entidad de la simulación."""
+        if self.entities.remove(entity):
+            self.stats.removed(entity)
+            self.pool.release(entity)
+        if self.grid[entity.y][entity.x] == entity:
+            self.set_cell(entity.x, entity.y, None)
+
+    def population_counts(self):
+        """Entidades vivas de cada tipo, en el orden de POPULATION_KINDS."""
+        live = self.stats.live
+        return tuple(live[cls.kind] for cls in POPULATION_CLASSES)
+
+    def get_grid_codes(self):
+        """Devuelve la cuadrícula como un bytearray de códigos enteros (fila a fila, ver CELL_LABELS)."""
+        codes = bytearray(self.terrain)  # Las entidades tapan el terreno de su celda
+        width = self.width
+        for entity in self.entities.dense:
+            codes[entity.y * width + entity.x] = ENTITY_CODES[entity.__class__] + (entity.state != LIVE)
+        return codes
+
+    def get_cell_codes(self, cells):
+        """Códigos (ver CELL_LABELS) de las celdas indicadas por índice."""
+        codes = []
+        for i in cells:
+            cell = self.grid[i // self.width][i % self.width]
+            if cell is None:
+                codes.append(self.terrain[i])
+            else:
+                codes.append(ENTITY_CODES[cell.__class__] + (cell.state != LIVE))
+        return codes
+
+    def get_grid_state(self):
+        """Devuelve el estado actual de la cuadrícula como una lista de listas."""
+        codes = self.get_grid_codes()
+        width = self.width
+        return [[CELL_LABELS[code] for code in codes[y * width:(y + 1) * width]] for y in range(self.height)]